@@ -0,0 +1,31 @@
+"""add_feed_status_http_validators
+
+Revision ID: e5a91c7b2f04
+Revises: d4c8e2f1a3b9
+Create Date: 2025-12-02 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a91c7b2f04"
+down_revision: Union[str, Sequence[str], None] = "d4c8e2f1a3b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("feed_status", sa.Column("etag", sa.String(length=255), nullable=True))
+    op.add_column("feed_status", sa.Column("last_modified", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("feed_status", "last_modified")
+    op.drop_column("feed_status", "etag")
@@ -1,10 +1,11 @@
 from utils.logging_config import configure_logging
-from utils.env_validation import settings
+from utils.env_validation import get_settings
 
 # Configure logging at the entry point
 configure_logging()
 
 # Ensure environment variables are validated at startup
+get_settings()
 print("Environment variables loaded successfully.")
 
 
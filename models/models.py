@@ -9,6 +9,21 @@ from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
+# Longest article body / summary stored; anything longer is cut and marked with "..."
+MAX_TEXT_LENGTH = 10000
+
+
+def truncate_text(text: Optional[str]) -> Optional[str]:
+    """Cut `text` down to MAX_TEXT_LENGTH characters."""
+    if text and len(text) > MAX_TEXT_LENGTH:
+        return text[:MAX_TEXT_LENGTH] + "..."
+    return text
+
+
+def article_hash(website: str, headline: str, link: str) -> str:
+    """Generate unique hash for duplicate detection"""
+    return hashlib.md5(f"{website}{headline}{link}".encode()).hexdigest()
+
 
 class Article(Base):
     __tablename__ = "articles"
@@ -46,6 +61,9 @@ class FeedStatus(Base):
     last_success_at = Column(DateTime, nullable=True)
     articles_count = Column(Integer, nullable=True)
     is_active = Column(Boolean, nullable=True)
+    # HTTP validators of the last successful fetch, sent back as a conditional GET
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
     # error_count = Column(Integer, nullable=True)
     # last_error = Column(Text, nullable=True)
 
@@ -92,6 +110,8 @@ class FeedConfig(BaseModel):
     country: str
     language: str
     enabled: bool = True
+    # Run feedparser's HTML sanitizer and relative-URI resolution on untrusted feeds
+    sanitize_html: bool = False
 
 
 class ParserSettings(BaseModel):
@@ -122,11 +142,8 @@ class ArticleCreate(BaseModel):
 
     @validator("content", "summary")
     def truncate_long_text(cls, v):
-        if v and len(v) > 10000:
-            return v[:10000] + "..."
-        return v
+        return truncate_text(v)
 
     def generate_hash(self) -> str:
         """Generate unique hash for duplicate detection"""
-        content = f"{self.website}{self.headline}{self.link}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return article_hash(self.website, self.headline, self.link)
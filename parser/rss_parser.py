@@ -1,135 +1,490 @@
 from dotenv import load_dotenv
 import os
-import feedparser
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, NamedTuple
-import langdetect
+from functools import lru_cache
+from typing import List, Dict, Iterable, Optional, NamedTuple, Set, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from models.models import Article, FeedStatus, ArticleCreate, FeedConfig
+from sqlalchemy.dialects import postgresql, sqlite
+from models.models import Article, FeedStatus, FeedConfig, article_hash, truncate_text
 from parser.config_loader import load_feeds_config, get_enabled_feeds
 from db.database import SessionLocal, get_db
 
+# lxml-backed reader exposing a feedparser-compatible `parse()`; falls back to feedparser
+from parser import feed_reader as feedparser
+
 load_dotenv()
 
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING
+_CONFLICT_SAFE_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Entry fields holding the article body, in order of preference
+_CONTENT_FIELDS = ("content", "description", "summary")
+
+# LRU of content hashes known to be stored, so back-to-back polls of a feed skip the
+# duplicate lookup for articles they have already seen
+SEEN_HASHES_MAX = 4096
+_SEEN_HASHES: "OrderedDict[str, None]" = OrderedDict()
+
+# Upper bound on concurrent feed downloads in main()
+MAX_FEED_WORKERS = 8
+
+# Detection accuracy plateaus after a few hundred characters while its cost keeps growing
+LANGDETECT_MAX_CHARS = 500
+
+# Longest headline the articles table accepts
+HEADLINE_MAX_LENGTH = Article.__table__.c.headline.type.length
+
 
 class ParseResult(NamedTuple):
     """Result of parsing a feed."""
 
     processed: int
     errors: int
+    not_modified: bool = False
+
+
+class _FeedFields(NamedTuple):
+    """Article fields that come from the feed config, resolved once per feed."""
+
+    name: str
+    category: str
+    country: str
+    language: Optional[str]
+
+
+class _ArticleRow(NamedTuple):
+    """Article built from a feed entry, turned into an `Article` only when it is inserted.
+
+    Fields are the Article columns filled in from feed entries (id and parsed_at use
+    column defaults).
+    """
+
+    website: str
+    headline: str
+    summary: Optional[str]
+    content: Optional[str]
+    link: str
+    published_at: datetime
+    language: str
+    content_hash: str
+    feed_name: str
+    category: str
+    country: str
 
 
 def parse_feed(db: Session, feed_config: FeedConfig) -> ParseResult:
     """Parse a single RSS feed and save articles to database."""
     try:
-        feed = feedparser.parse(feed_config.url)
-
-        # Check for critical HTTP errors (4xx/5xx excluding 301/302 redirects)
-        status = getattr(feed, "status", 200)
-        if status and status >= 400:
-            error_msg = f"HTTP error {status} fetching feed"
-            update_feed_status(
-                db, feed_config.name, feed_config.url, success=False, error=error_msg
-            )
-            return ParseResult(processed=0, errors=1)
-
-        # Bozo errors are non-fatal if we have entries to parse
-        # (e.g., minor XML issues, incomplete feeds)
-        # Only fail if we have no entries AND a serious bozo exception
-        if getattr(feed, "bozo", False) is True and len(feed.entries) == 0:
-            error_msg = (
-                str(getattr(feed, "bozo_exception", "Unknown parsing error"))
-                if getattr(feed, "bozo_exception", None)
-                else "Unknown parsing error"
-            )
-            update_feed_status(
-                db, feed_config.name, feed_config.url, success=False, error=error_msg
+        status = db.query(FeedStatus).filter_by(feed_name=feed_config.name).first()
+        feed = feedparser.parse(feed_config.url, **_parse_options(feed_config, status))
+    except Exception as e:
+        return _record_feed_error(db, feed_config, f"Error parsing feed: {str(e)}")
+
+    return _save_parsed_feed(db, feed_config, feed)
+
+
+def parse_feeds(db: Session, feed_configs: List[FeedConfig], workers: int = 4) -> List[ParseResult]:
+    """Parse several RSS feeds, downloading them concurrently.
+
+    Fetching is network bound, so feeds are downloaded in a thread pool. The entries of
+    all feeds are then saved together on the calling thread (a SQLAlchemy session must
+    not be shared between threads) with one duplicate query and one insert.
+    """
+    results: List[Optional[ParseResult]] = [None] * len(feed_configs)
+    parsed = []
+    statuses = _feed_statuses(db, feed_configs)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                feedparser.parse, config.url, **_parse_options(config, statuses.get(config.name))
             )
-            return ParseResult(processed=0, errors=1)
+            for config in feed_configs
+        ]
+        for idx, (feed_config, future) in enumerate(zip(feed_configs, futures, strict=True)):
+            try:
+                feed = future.result()
+            except Exception as e:
+                results[idx] = _record_feed_error(db, feed_config, f"Error parsing feed: {str(e)}")
+                continue
+
+            if _is_not_modified(feed):
+                results[idx] = _record_not_modified(db, feed_config)
+                continue
+
+            error_msg = _feed_error(feed)
+            if error_msg:
+                results[idx] = _record_feed_error(db, feed_config, error_msg)
+            else:
+                parsed.append((idx, feed_config, feed))
+
+    try:
+        new_articles = process_feeds_batch(
+            db, [(feed_config, feed.entries) for _, feed_config, feed in parsed]
+        )
+    except Exception as e:
+        # One bad row fails the whole insert; save feed by feed so only its feed fails
+        print(f"Batch insert failed, saving feeds one at a time: {str(e)}")
+        for idx, feed_config, feed in parsed:
+            results[idx] = _save_parsed_feed(db, feed_config, feed)
+        return results
+
+    for idx, feed_config, feed in parsed:
+        count = len(new_articles[str(feed_config.name)])
+        update_feed_status(
+            db,
+            feed_config.name,
+            feed_config.url,
+            success=True,
+            articles_count=count,
+            **_feed_validators(feed),
+        )
+        results[idx] = ParseResult(processed=count, errors=0)
+
+    return results
+
+
+def _parse_options(feed_config: FeedConfig, status: Optional[FeedStatus] = None) -> Dict:
+    """Extra `feedparser.parse` options for a feed.
+
+    Validators stored by the previous run make the fetch a conditional GET, and untrusted
+    feeds opt back into HTML sanitizing.
+    """
+    options = {}
+    if status is not None:
+        if status.etag:
+            options["etag"] = status.etag
+        if status.last_modified:
+            options["modified"] = status.last_modified
+    if getattr(feed_config, "sanitize_html", False):
+        options.update(resolve_relative_uris=True, sanitize_html=True)
+    return options
+
+
+def _feed_statuses(db: Session, feed_configs: List[FeedConfig]) -> Dict[str, FeedStatus]:
+    """Load the stored status of each feed with a single query."""
+    names = [feed_config.name for feed_config in feed_configs]
+    rows = db.query(FeedStatus).filter(FeedStatus.feed_name.in_(names)).all()
+    return {status.feed_name: status for status in rows}
+
+
+def _feed_validators(feed) -> Dict[str, str]:
+    """The ETag / Last-Modified a fetched feed came with, for the next conditional GET."""
+    validators = {"etag": feed.get("etag"), "last_modified": feed.get("modified")}
+    return {key: value for key, value in validators.items() if isinstance(value, str)}
+
+
+def _save_parsed_feed(db: Session, feed_config: FeedConfig, feed) -> ParseResult:
+    """Validate a parsed feed and save its new articles to database."""
+    try:
+        if _is_not_modified(feed):
+            return _record_not_modified(db, feed_config)
+
+        error_msg = _feed_error(feed)
+        if error_msg:
+            return _record_feed_error(db, feed_config, error_msg)
 
         new_articles = process_feed_entries(db, feed.entries, feed_config)
         update_feed_status(
-            db, feed_config.name, feed_config.url, success=True, articles_count=len(new_articles)
+            db,
+            feed_config.name,
+            feed_config.url,
+            success=True,
+            articles_count=len(new_articles),
+            **_feed_validators(feed),
         )
 
         return ParseResult(processed=len(new_articles), errors=0)
 
     except Exception as e:
-        error_msg = f"Error parsing feed: {str(e)}"
-        update_feed_status(db, feed_config.name, feed_config.url, success=False, error=error_msg)
-        return ParseResult(processed=0, errors=1)
+        return _record_feed_error(db, feed_config, f"Error parsing feed: {str(e)}")
+
+
+def _feed_error(feed) -> Optional[str]:
+    """Return why a parsed feed can't be used, or None if its entries can be saved."""
+    # Check for critical HTTP errors (4xx/5xx excluding 301/302 redirects)
+    status = getattr(feed, "status", 200)
+    if status and status >= 400:
+        return f"HTTP error {status} fetching feed"
+
+    # Bozo errors are non-fatal if we have entries to parse
+    # (e.g., minor XML issues, incomplete feeds)
+    # Only fail if we have no entries AND a serious bozo exception
+    if getattr(feed, "bozo", False) is True and len(feed.entries) == 0:
+        return (
+            str(getattr(feed, "bozo_exception", "Unknown parsing error"))
+            if getattr(feed, "bozo_exception", None)
+            else "Unknown parsing error"
+        )
+
+    return None
+
+
+def _is_not_modified(feed) -> bool:
+    """Whether the server answered a conditional GET with 304 Not Modified."""
+    return getattr(feed, "status", 200) == 304
+
+
+def _record_not_modified(db: Session, feed_config: FeedConfig) -> ParseResult:
+    """Mark an unchanged feed as successfully checked, keeping its article count."""
+    update_feed_status(db, feed_config.name, feed_config.url, success=True)
+    return ParseResult(processed=0, errors=0, not_modified=True)
+
+
+def _record_feed_error(db: Session, feed_config: FeedConfig, error_msg: str) -> ParseResult:
+    """Mark a feed as failed and return the matching parse result."""
+    update_feed_status(db, feed_config.name, feed_config.url, success=False, error=error_msg)
+    return ParseResult(processed=0, errors=1)
 
 
 def process_feed_entries(
     db: Session, entries: List[Dict], feed_config: FeedConfig
 ) -> List[Article]:
     """Process feed entries and save new articles to database."""
-    new_articles = []
+    return _save_new_articles(db, _build_candidates(entries, feed_config))
 
-    for entry in entries:
-        try:
-            # Extract fields
-            published = entry.get("published_parsed") or entry.get("updated_parsed")
-            published_at = datetime(*published[:6]) if published else datetime.now()
 
-            # Try to detect language
-            content = entry.get("content", [{"value": entry.get("description", "")}])[0]["value"]
-            try:
-                language = langdetect.detect(content)
-            except:
-                # coerce feed_config.language to string in case tests pass a MagicMock
-                language = str(getattr(feed_config, "language", "unknown"))
-            # ensure language is a string
-            language = str(language) if language is not None else "unknown"
-
-            # Create article
-            # Coerce feed_config fields to plain strings to satisfy Pydantic validators
-            feed_name = str(getattr(feed_config, "name", ""))
-            category = str(getattr(feed_config, "category", ""))
-            country = str(getattr(feed_config, "country", ""))
-
-            article = ArticleCreate(
-                website=feed_name,
-                headline=entry.get("title", "No title"),
-                summary=entry.get("description"),
-                content=content,
-                link=entry.get("link", ""),
-                published_at=published_at,
-                language=language,
-                feed_name=feed_name,
-                category=category,
-                country=country,
-            )
+def process_feeds_batch(
+    db: Session, feeds_and_entries: List[Tuple[FeedConfig, List[Dict]]]
+) -> Dict[str, List[Article]]:
+    """Process the entries of several feeds with one duplicate query and one insert.
+
+    Returns the new articles grouped by feed name.
+    """
+    candidates = []
+    for feed_config, entries in feeds_and_entries:
+        candidates.extend(_build_candidates(entries, feed_config))
+
+    new_articles = {str(feed_config.name): [] for feed_config, _ in feeds_and_entries}
+    for article in _save_new_articles(db, candidates):
+        new_articles[article.feed_name].append(article)
+    return new_articles
 
-            # Check for duplicates using content hash
-            content_hash = article.generate_hash()
-            existing = db.query(Article).filter_by(content_hash=content_hash).first()
-
-            if not existing:
-                db_article = Article(
-                    website=article.website,
-                    headline=article.headline,
-                    summary=article.summary,
-                    content=article.content,
-                    link=article.link,
-                    published_at=article.published_at,
-                    language=article.language,
-                    content_hash=content_hash,
-                    feed_name=article.feed_name,
-                    category=article.category,
-                    country=article.country,
-                )
-                db.add(db_article)
-                db.commit()
-                db.refresh(db_article)
-                new_articles.append(db_article)
 
+def _build_candidates(entries: List[Dict], feed_config: FeedConfig) -> List[_ArticleRow]:
+    """Turn feed entries into validated article rows."""
+    # Sized up front: every entry yields at most one candidate
+    candidates = [None] * len(entries)
+    count = 0
+    # Undated entries of one feed share a single fetch timestamp
+    now = datetime.now()
+    feed = _FeedFields(
+        # Coerce feed_config fields to plain strings to match the Article columns
+        name=str(getattr(feed_config, "name", "")),
+        category=str(getattr(feed_config, "category", "")),
+        country=str(getattr(feed_config, "country", "")),
+        # A declared language applies to every entry; detect it only without one
+        language=str(getattr(feed_config, "language", "") or "") or None,
+    )
+
+    for entry in entries:
+        try:
+            candidates[count] = _build_article(entry, feed, now)
         except Exception as e:
             print(f"Error processing entry: {str(e)}")
             continue
+        count += 1
+
+    return candidates[:count]
+
+
+def _build_article(entry: Dict, feed: _FeedFields, now: datetime) -> _ArticleRow:
+    """Build the article row for a single feed entry."""
+    headline = entry.get("title", "No title")
+    link = entry.get("link", "")
+    if not isinstance(headline, str) or not isinstance(link, str):
+        raise ValueError(f"Invalid title or link: {headline!r}, {link!r}")
+    # An over-long title would fail the insert of every article saved alongside it
+    headline = headline[:HEADLINE_MAX_LENGTH]
+
+    # Extract fields
+    published_at = parse_published_date(entry, default=now)
+
+    content = extract_content(entry)
+    language = feed.language or detect_language(content)
+
+    return _ArticleRow(
+        website=feed.name,
+        headline=headline,
+        summary=truncate_text(entry.get("description")),
+        content=truncate_text(content),
+        link=link,
+        published_at=published_at,
+        language=language,
+        content_hash=article_hash(feed.name, headline, link),
+        feed_name=feed.name,
+        category=feed.category,
+        country=feed.country,
+    )
 
-    return new_articles
+
+def _save_new_articles(db: Session, candidates: List[_ArticleRow]) -> List[Article]:
+    """Save the candidates that aren't stored yet and return them as Article rows."""
+    # Articles seen in recent polls are already stored; skip them without a query
+    unseen = []
+    for row in candidates:
+        if row.content_hash in _SEEN_HASHES:
+            _SEEN_HASHES.move_to_end(row.content_hash)
+        else:
+            unseen.append(row)
+
+    if not unseen:
+        return []
+
+    # Check for duplicates using content hash, with a single query for the whole feed
+    existing = _existing_hashes(db, [row.content_hash for row in unseen])
+    _remember_hashes(existing)
+    new_rows = []
+
+    for row in unseen:
+        if row.content_hash in existing:
+            continue
+        # The same article may appear twice within one feed
+        existing.add(row.content_hash)
+        new_rows.append(row)
+
+    # Insert the whole feed in one statement instead of a commit per article
+    if not new_rows:
+        return []
+    try:
+        inserted = _insert_articles(db, new_rows)
+    except Exception:
+        db.rollback()
+        raise
+
+    # Conflicting rows were skipped because they are stored too, so remember every hash
+    _remember_hashes(row.content_hash for row in new_rows)
+    return inserted
+
+
+def _insert_articles(db: Session, rows: List[_ArticleRow]) -> List[Article]:
+    """Insert `rows` and return the ones that were actually stored as Article objects.
+
+    On PostgreSQL and SQLite this is a single INSERT ... ON CONFLICT DO NOTHING against
+    the unique content_hash index, so an article saved by a concurrent run between our
+    duplicate check and the insert is skipped instead of failing the whole feed.
+    """
+    insert = _CONFLICT_SAFE_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        # Bulk save skips the unit-of-work bookkeeping of add_all(); the returned
+        # articles stay detached, which is fine as callers only read their fields
+        articles = [Article(**row._asdict()) for row in rows]
+        db.bulk_save_objects(articles)
+        db.commit()
+        return articles
+
+    stmt = (
+        insert(Article)
+        .on_conflict_do_nothing(index_elements=["content_hash"])
+        .returning(Article.content_hash)
+    )
+    inserted = set(db.execute(stmt, [row._asdict() for row in rows]).scalars())
+    db.commit()
+    return [Article(**row._asdict()) for row in rows if row.content_hash in inserted]
+
+
+def parse_published_date(entry: Dict, default: Optional[datetime] = None) -> datetime:
+    """Return the entry's publication time, or `default` (now) if the feed doesn't provide one.
+
+    feedparser dates are UTC `time.struct_time` tuples, which map directly onto the
+    `datetime` constructor without a round-trip through a timestamp. Malformed dates are
+    treated like missing ones.
+    """
+    published = (
+        entry.get("published_parsed") or entry.get("updated_parsed") or entry.get("created_parsed")
+    )
+    if published:
+        try:
+            return datetime(
+                published[0], published[1], published[2], published[3], published[4], published[5]
+            )
+        except (TypeError, ValueError, IndexError):
+            pass
+    return default or datetime.now()
+
+
+def extract_content(entry: Dict) -> str:
+    """Return the richest text body available on a feed entry."""
+    if entry is None:
+        return ""
+    for field in _CONTENT_FIELDS:
+        value = entry.get(field)
+        if not value:
+            continue
+        if field == "content":
+            # A list of content objects; skip it if it isn't shaped like one
+            try:
+                first = value[0]
+                return first["value"] if isinstance(first, dict) else first
+            except (IndexError, KeyError, TypeError):
+                continue
+        return value
+    return ""
+
+
+def detect_language(text: str, default: str = "unknown") -> str:
+    """Detect the language of `text`, returning `default` if detection fails.
+
+    Uses the fastText language-ID model when `FASTTEXT_LID_MODEL` points to one (e.g.
+    the quantized lid.176.ftz), otherwise langdetect. `langdetect.detect` shares one
+    process-wide detector factory, so its profiles are only loaded on the first call.
+    Only the first `LANGDETECT_MAX_CHARS` characters are inspected.
+    """
+    sample = text[:LANGDETECT_MAX_CHARS]
+    try:
+        model = _fasttext_model()
+        if model is not None:
+            labels, _ = model.predict(sample.replace("\n", " "), k=1)
+            language = labels[0].replace("__label__", "")
+        else:
+            language = _langdetect().detect(sample)
+    except Exception:
+        return default
+    # ensure language is a string
+    return str(language) if language is not None else "unknown"
+
+
+@lru_cache(maxsize=1)
+def _langdetect():
+    """Import langdetect on first use, so runs that never detect skip its slow import."""
+    import langdetect
+
+    # langdetect is non-deterministic unless seeded; seed once for the whole process
+    langdetect.DetectorFactory.seed = 0
+    return langdetect
+
+
+@lru_cache(maxsize=1)
+def _fasttext_model():
+    """Load the fastText model named by FASTTEXT_LID_MODEL once, or return None."""
+    model_path = os.getenv("FASTTEXT_LID_MODEL")
+    if not model_path:
+        return None
+    try:
+        import fasttext
+
+        return fasttext.load_model(model_path)
+    except Exception as e:
+        print(f"Could not load fastText model {model_path}, using langdetect: {str(e)}")
+        return None
+
+
+def _remember_hashes(content_hashes: Iterable[str]) -> None:
+    """Add stored article hashes to the LRU cache, evicting the oldest ones."""
+    for content_hash in content_hashes:
+        _SEEN_HASHES[content_hash] = None
+        _SEEN_HASHES.move_to_end(content_hash)
+    while len(_SEEN_HASHES) > SEEN_HASHES_MAX:
+        _SEEN_HASHES.popitem(last=False)
+
+
+def _existing_hashes(db: Session, content_hashes: List[str]) -> Set[str]:
+    """Return the subset of `content_hashes` already stored in the database."""
+    rows = db.query(Article.content_hash).filter(Article.content_hash.in_(content_hashes)).all()
+    return {row[0] for row in rows}
 
 
 def update_feed_status(
@@ -139,8 +494,14 @@ def update_feed_status(
     success: bool = True,
     error: Optional[str] = None,
     articles_count: Optional[int] = None,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
 ) -> FeedStatus:
-    """Update the status of a feed after parsing."""
+    """Update the status of a feed after parsing.
+
+    `etag` / `last_modified` are the validators of a successful fetch; they are kept
+    until a later fetch returns new ones.
+    """
     status = db.query(FeedStatus).filter_by(feed_name=feed_name).first()
 
     if not status:
@@ -152,6 +513,10 @@ def update_feed_status(
         status.last_success_at = datetime.now()
         if articles_count is not None:
             status.articles_count = articles_count
+        if etag is not None:
+            status.etag = etag
+        if last_modified is not None:
+            status.last_modified = last_modified
 
     db.commit()
     db.refresh(status)
@@ -170,9 +535,16 @@ def main():
     # Initialize database session
     db = next(get_db())
 
-    # Parse feeds and update stats
-    for feed_config in get_enabled_feeds(config):
-        result = parse_feed(db, feed_config)
+    # Parse feeds concurrently; a single worker keeps the sequential path for debugging
+    feed_configs = get_enabled_feeds(config)
+    workers = min(MAX_FEED_WORKERS, len(feed_configs))
+    if workers > 1:
+        results = parse_feeds(db, feed_configs, workers=workers)
+    else:
+        results = [parse_feed(db, feed_config) for feed_config in feed_configs]
+
+    # Update stats
+    for result in results:
         stats["total_parsed"] += result.processed
         stats["errors"] += result.errors
 
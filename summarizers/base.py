@@ -5,7 +5,17 @@ from typing import List, Dict, Any
 
 
 class NewsSummarizer(ABC):
-    """Abstract base class for news summarizers."""
+    """Abstract base class for news summarizers.
+
+    Subclasses set `model_name`, the name of the summarization model, as a class attribute.
+    """
+
+    model_name: str = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not isinstance(cls.model_name, str) or not cls.model_name:
+            raise TypeError(f"{cls.__name__} must set a non-empty `model_name` string")
 
     @abstractmethod
     def summarize_articles(self, articles: List[Dict[str, Any]]) -> str:
@@ -19,9 +29,3 @@ class NewsSummarizer(ABC):
             str: Generated summary
         """
         pass
-
-    @property
-    @abstractmethod
-    def model_name(self) -> str:
-        """Return the name of the summarization model."""
-        pass
@@ -21,6 +21,8 @@ logger = logging.getLogger(__name__)
 class GrokSummarizer(NewsSummarizer):
     """Grok-based implementation of news summarization."""
 
+    model_name = "grok"
+
     def __init__(self, db: Session):
         self.api_key = os.getenv("XAI_API_KEY")
         if not self.api_key:
@@ -29,10 +31,6 @@ class GrokSummarizer(NewsSummarizer):
         self.client = Client(api_key=self.api_key)
         self.db = db
 
-    @property
-    def model_name(self) -> str:
-        return "grok"
-
     def summarize_articles(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Send articles to Grok API for summarization using structured reasoning approach.
@@ -0,0 +1,315 @@
+import os
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import orjson
+
+import requests
+
+from tg_bot import bot
+from tg_bot.bot import (
+    MAX_DELAY,
+    _Breaker,
+    _TokenBucket,
+    _parse,
+    _split_message,
+    format_summary,
+    send_daily_summary,
+    send_telegram_message,
+)
+from utils.env_validation import get_telegram_settings
+
+
+class TestSplitMessage(unittest.TestCase):
+    # (message, limit, expected chunks)
+    CASES = [
+        ("short", 10, ["short"]),  # fits, returned as is
+        ("aaaa\n\nbbbb\n\ncccc", 12, ["aaaa\n\nbbbb", "cccc"]),  # packed by paragraph
+        ("aaaa\n\nbbbb\n\ncccc", 6, ["aaaa", "bbbb", "cccc"]),  # one paragraph per chunk
+        ("aaaa   \n\nbbbbbbbb", 10, ["aaaa", "bbbbbbbb"]),  # trailing whitespace trimmed
+        ("ab\n\nxxxxxxxxxx\n\ncd", 4, ["ab", "xxxx", "xxxx", "xx", "cd"]),  # hard split
+        ("aaaa\n\n\n\nbbbb", 8, ["aaaa", "bbbb"]),  # empty paragraph trimmed
+        ("x" * 9, 4, ["xxxx", "xxxx", "x"]),  # no paragraph breaks at all
+    ]
+
+    def test_split_message(self):
+        for message, limit, expected in self.CASES:
+            with self.subTest(message=message, limit=limit):
+                chunks = _split_message(message, limit)
+
+                self.assertEqual(chunks, expected)
+                self.assertTrue(all(len(chunk) <= limit for chunk in chunks))
+
+
+class TestFormatSummary(unittest.TestCase):
+    def setUp(self):
+        self.summary = {
+            "date": datetime(2025, 11, 28, 0, 0, 0),
+            "category": "business",
+            "country": "global",
+            "articles_count": 2,
+            "text_summary": "Markets up",
+            "main_events": {"Surge": "Markets gained 2%"},
+            "key_themes": {"Growth": "Positive indicators"},
+            "detailed_summary": "Financial markets rallied.",
+            "top_articles": [
+                {"title": "Market Report", "source": "FT", "link": "https://ft.com/1"},
+                {"title": "Tech IPO", "source": "Bloomberg"},
+            ],
+        }
+
+    def test_format_summary(self):
+        # When
+        message = format_summary(self.summary)
+
+        # Then
+        self.assertEqual(
+            message,
+            "📅 Date: November 28, 2025\n"
+            "📂 Category: business\n"
+            "🌍 Country: global\n"
+            "📰 Articles Count: 2\n\n"
+            "📝 Summary:\nMarkets up\n\n"
+            "🔑 Main Events:\n  - Markets gained 2%\n"
+            "\n💡 Key Themes:\n  - Positive indicators\n"
+            "\n📖 Detailed Summary:\nFinancial markets rallied.\n"
+            "\n🔗 Top Articles:\n"
+            "  1. [Market Report - FT](https://ft.com/1)\n"
+            "  2. Tech IPO - Bloomberg\n",
+        )
+
+    def test_format_summary_escapes_markdown(self):
+        # Given
+        self.summary["main_events"] = {"Rates": "ECB *cuts* rates_today"}
+        self.summary["top_articles"] = [
+            {"title": "The [big] deal", "source": "FT", "link": "https://ft.com/1"},
+            {"title": "snake_case `tips`", "source": "Blog"},
+        ]
+
+        # When
+        message = format_summary(self.summary)
+
+        # Then
+        self.assertIn("  - ECB \\*cuts\\* rates\\_today\n", message)
+        self.assertIn("  1. [The (big) deal - FT](https://ft.com/1)\n", message)
+        self.assertIn("  2. snake\\_case \\`tips\\` - Blog\n", message)
+
+    def test_format_summary_date_types(self):
+        for value in (datetime(2025, 11, 28, 9, 30), date(2025, 11, 28), "2025-11-28 09:30:00"):
+            with self.subTest(value=value):
+                self.summary["date"] = value
+
+                message = format_summary(self.summary)
+
+                self.assertTrue(message.startswith("📅 Date: November 28, 2025\n"))
+
+
+class TestParse(unittest.TestCase):
+    def test_parse(self):
+        # Given
+        ok = MagicMock(status_code=200, content=b'{"ok": true, "result": {"message_id": 1}}')
+        broken = MagicMock(status_code=502, content=b"<html>Bad Gateway</html>")
+
+        # When / Then
+        self.assertEqual(_parse(ok), {"ok": True, "result": {"message_id": 1}})
+        self.assertEqual(
+            _parse(broken), {"ok": False, "error": "invalid-json-response", "status_code": 502}
+        )
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch("tg_bot.bot.time.sleep")
+    @patch("tg_bot.bot.time.monotonic", return_value=100.0)
+    def test_acquire_waits_once_burst_is_spent(self, mock_monotonic, mock_sleep):
+        # Given
+        bucket = _TokenBucket(capacity=2, rate=2)
+
+        # When - the burst is free, the third call has to wait for a refill
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        bucket.acquire()
+
+        # Then
+        mock_sleep.assert_called_once_with(0.5)
+
+    @patch("tg_bot.bot.time.sleep")
+    @patch("tg_bot.bot.time.monotonic", side_effect=[100.0, 100.0, 101.0])
+    def test_acquire_refills_over_time(self, mock_monotonic, mock_sleep):
+        # Given
+        bucket = _TokenBucket(capacity=1, rate=1)
+
+        # When
+        bucket.acquire()
+        bucket.acquire()
+
+        # Then
+        mock_sleep.assert_not_called()
+
+
+class TestBreaker(unittest.TestCase):
+    @patch("tg_bot.bot.time.monotonic")
+    def test_opens_after_threshold_and_probes_after_cooldown(self, mock_monotonic):
+        # Given
+        mock_monotonic.return_value = 100.0
+        breaker = _Breaker()
+        for _ in range(_Breaker.THRESHOLD):
+            breaker.record(ok=False)
+
+        # Then - open until the cooldown has passed
+        self.assertFalse(breaker.allow())
+        mock_monotonic.return_value = 100.0 + _Breaker.COOLDOWN
+        # Half-open: a single probe goes through
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        # A successful probe closes it again
+        breaker.record(ok=True)
+        self.assertTrue(breaker.allow())
+
+    @patch("tg_bot.bot.time.monotonic", return_value=100.0)
+    def test_failed_probe_reopens(self, mock_monotonic):
+        # Given
+        breaker = _Breaker()
+        for _ in range(_Breaker.THRESHOLD):
+            breaker.record(ok=False)
+        mock_monotonic.return_value += _Breaker.COOLDOWN
+
+        # When
+        self.assertTrue(breaker.allow())
+        breaker.record(ok=False)
+
+        # Then
+        self.assertFalse(breaker.allow())
+
+
+def _ok_response():
+    return MagicMock(status_code=200, content=b'{"ok": true}')
+
+
+def _posted_texts(mock_post):
+    return [orjson.loads(call.kwargs["data"])["text"] for call in mock_post.call_args_list]
+
+
+@patch("tg_bot.bot.time.sleep")
+@patch("tg_bot.bot._BREAKER", new_callable=_Breaker)
+@patch("tg_bot.bot._throttle")
+class TestSendTelegramMessage(unittest.TestCase):
+    @patch("tg_bot.bot._SESSION.post", return_value=_ok_response())
+    def test_posts_json_body(self, mock_post, *mocks):
+        # When
+        send_telegram_message("token", "42", "Hello *world*")
+
+        # Then
+        mock_post.assert_called_once_with(
+            "https://api.telegram.org/bottoken/sendMessage",
+            data=orjson.dumps({"chat_id": "42", "text": "Hello *world*", "parse_mode": "Markdown"}),
+            headers={"Content-Type": "application/json"},
+            timeout=30,
+        )
+
+    @patch("tg_bot.bot.random.random", return_value=1.0)
+    @patch("tg_bot.bot._SESSION.post", return_value=MagicMock(status_code=502, content=b""))
+    def test_server_errors_are_retried_with_backoff(self, mock_post, mock_random, *mocks):
+        # When
+        with self.assertLogs(level="WARNING"):
+            response = send_telegram_message("token", "42", "Hello", max_retries=3)
+
+        # Then
+        self.assertFalse(response["ok"])
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(bot._BREAKER.fails, 3)
+        # BASE_DELAY * 2**attempt, stretched by the full JITTER
+        self.assertEqual([c.args[0] for c in bot.time.sleep.call_args_list], [1.5, 3.0, 6.0])
+
+    @patch("tg_bot.bot._SESSION.post")
+    def test_retry_after_is_capped(self, mock_post, *mocks):
+        # Given
+        rate_limited = MagicMock(status_code=429, content=b'{"ok": false}')
+        rate_limited.headers = {"Retry-After": "3600"}
+        mock_post.side_effect = [rate_limited, _ok_response()]
+
+        # When
+        with self.assertLogs(level="WARNING"):
+            response = send_telegram_message("token", "42", "Hello")
+
+        # Then
+        self.assertTrue(response["ok"])
+        bot.time.sleep.assert_called_once_with(MAX_DELAY)
+
+    @patch("tg_bot.bot.TG_MAX_MESSAGE_CHARS", 5)
+    @patch("tg_bot.bot._SESSION.post")
+    def test_open_breaker_stops_the_rest_of_the_message(self, mock_post, *mocks):
+        # Given - the first chunk goes out, then the network fails for the second
+        mock_post.side_effect = [_ok_response()] + [requests.ConnectionError("down")] * 10
+
+        # When
+        with self.assertLogs(level="WARNING"):
+            response = send_telegram_message("token", "42", "aaa\n\nbbb", max_retries=10)
+
+        # Then - no more attempts once THRESHOLD failures opened the breaker
+        self.assertEqual(response, {"ok": False, "error": "breaker-open"})
+        self.assertEqual(mock_post.call_count, 1 + _Breaker.THRESHOLD)
+        self.assertFalse(bot._BREAKER.allow())
+
+
+_ENV = {
+    "DATABASE_URL": "sqlite:///:memory:",
+    "TG_API_KEY": "token",
+    "CHAT_ID": "42",
+    "XAI_API_KEY": "x",
+}
+
+
+@patch.dict(os.environ, _ENV, clear=True)
+@patch("tg_bot.bot.time.sleep")
+@patch("tg_bot.bot._BREAKER", new_callable=_Breaker)
+@patch("tg_bot.bot.get_db", side_effect=lambda: iter([MagicMock()]))
+class TestSendDailySummary(unittest.TestCase):
+    def setUp(self):
+        # Credentials are read from the patched environment, not an earlier test's
+        get_telegram_settings.cache_clear()
+        self.addCleanup(get_telegram_settings.cache_clear)
+
+    @patch("tg_bot.bot.TG_MAX_MESSAGE_CHARS", 5)
+    @patch("tg_bot.bot.format_summary", side_effect=lambda s: f"{s}-1\n\n{s}-2\n\n{s}-3")
+    @patch("tg_bot.bot.get_daily_summaries", side_effect=lambda db, day: iter(["a", "b", "c"]))
+    @patch("tg_bot.bot._SESSION.post", return_value=_ok_response())
+    def test_sends_summaries_in_order(self, mock_post, *mocks):
+        # When - every summary is split into three chunks
+        send_daily_summary()
+
+        # Then - all chunks of a summary arrive before the next summary starts
+        self.assertEqual(
+            _posted_texts(mock_post),
+            ["a-1", "a-2", "a-3", "b-1", "b-2", "b-3", "c-1", "c-2", "c-3"],
+        )
+
+    @patch("tg_bot.bot._SESSION.post")
+    @patch("tg_bot.bot.get_daily_summaries")
+    def test_formats_each_summary_just_before_sending_it(self, mock_summaries, mock_post, *mocks):
+        # Given
+        events = []
+
+        def summaries(db, day):
+            for name in ("a", "b"):
+                events.append(f"fetch {name}")
+                yield {"name": name}
+
+        def post(url, data, **kwargs):
+            events.append(f"send {orjson.loads(data)['text']}")
+            return _ok_response()
+
+        mock_summaries.side_effect = summaries
+        mock_post.side_effect = post
+
+        # When
+        with patch("tg_bot.bot.format_summary", side_effect=lambda s: s["name"]):
+            send_daily_summary()
+
+        # Then - the next row is only read once the previous summary has been sent
+        self.assertEqual(events, ["fetch a", "send a", "fetch b", "send b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
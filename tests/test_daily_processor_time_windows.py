@@ -2,6 +2,7 @@
 
 import unittest
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 from sqlalchemy.orm import Session
 
@@ -12,92 +13,52 @@ import logging
 # Silence noisy logger during tests
 logging.getLogger("summarizers.daily_processor").setLevel(logging.CRITICAL)
 
+_TARGET_DATE = datetime(2025, 11, 28, 12, 0, 0)
 
-class TestFetchArticlesForDate(unittest.TestCase):
-    """Test article fetching with various time windows."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.mock_db = MagicMock(spec=Session)
-        self.mock_query = MagicMock()
-        self.mock_db.query.return_value = self.mock_query
-
-    def test_fetch_articles_daily_single_day(self):
-        """Test fetching articles for a single day (daily summarization)."""
-        # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-        articles = [
-            MagicMock(headline="Article 1", website="Source 1", category="business"),
-            MagicMock(headline="Article 2", website="Source 2", category="business"),
-        ]
-        self.mock_query.filter.return_value.filter.return_value.order_by.return_value.all.return_value = articles
-
-        # When
-        result = fetch_articles_for_date(self.mock_db, target_date, category="business", days=1)
-
-        # Then
-        self.assertEqual(result, articles)
-        self.assertEqual(len(result), 2)
 
-    def test_fetch_articles_weekly_seven_days(self):
-        """Test fetching articles for 7 days (weekly summarization)."""
-        # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-        articles = [
-            MagicMock(headline="Article 1", website="Source 1", category="engineering"),
-            MagicMock(headline="Article 2", website="Source 2", category="engineering"),
-            MagicMock(headline="Article 3", website="Source 3", category="engineering"),
-            MagicMock(headline="Article 4", website="Source 4", category="engineering"),
-            MagicMock(headline="Article 5", website="Source 5", category="engineering"),
-        ]
-        self.mock_query.filter.return_value.filter.return_value.order_by.return_value.all.return_value = articles
+def _set_articles_result(query, articles, category):
+    """Make the query chain `fetch_articles_for_date` should build return `articles`.
 
-        # When
-        result = fetch_articles_for_date(self.mock_db, target_date, category="engineering", days=7)
+    Only the chain with (or without) the category filter is stubbed, so applying the
+    filter wrongly returns a MagicMock instead of the articles.
+    """
+    chain = query.filter.return_value
+    if category:
+        chain = chain.filter.return_value
+    chain.order_by.return_value.all.return_value = articles
 
-        # Then
-        self.assertEqual(result, articles)
-        self.assertEqual(len(result), 5)
 
-    def test_fetch_articles_no_category_filter(self):
-        """Test fetching articles without category filter."""
-        # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-        articles = [
-            MagicMock(headline="Article 1"),
-            MagicMock(headline="Article 2"),
-            MagicMock(headline="Article 3"),
-        ]
-
-        # Patch the entire function to test the parameter passing
-        with patch("summarizers.daily_processor.fetch_articles_for_date") as mock_fetch:
-            mock_fetch.return_value = articles
-
-            # When
-            result = mock_fetch(self.mock_db, target_date, category=None, days=1)
-
-            # Then
-            self.assertEqual(len(result), 3)
-            self.assertEqual(result, articles)
-            # Verify it was called without category
-            mock_fetch.assert_called_once_with(self.mock_db, target_date, category=None, days=1)
-
-    def test_fetch_articles_empty_result(self):
-        """Test fetching articles with no results."""
-        # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-        self.mock_query.filter.return_value.filter.return_value.order_by.return_value.all.return_value = []
-
-        # Mock the fallback query
-        fallback_query = MagicMock()
-        self.mock_db.query.side_effect = [self.mock_query, fallback_query]
-        fallback_query.filter.return_value.filter.return_value.order_by.return_value.all.return_value = []
-
-        # When
-        result = fetch_articles_for_date(self.mock_db, target_date, category="business", days=1)
+class TestFetchArticlesForDate(unittest.TestCase):
+    """Test article fetching with various time windows."""
 
-        # Then
-        self.assertEqual(result, [])
+    # (days, category, number of articles returned)
+    CASES = [
+        (1, "business", 2),  # daily summarization
+        (7, "engineering", 5),  # weekly summarization
+        (1, None, 3),  # no category filter
+        (1, "business", 0),  # empty result, fallback query also empty
+    ]
+
+    def test_fetch_articles(self):
+        """Test fetching articles for each time window / category combination."""
+        for days, category, n in self.CASES:
+            with self.subTest(days=days, category=category, n=n):
+                # Given
+                mock_db = MagicMock(spec=Session)
+                mock_query = MagicMock()
+                mock_db.query.return_value = mock_query
+                articles = [SimpleNamespace(headline=f"Article {i}") for i in range(n)]
+                _set_articles_result(mock_query, articles, category)
+
+                # When
+                result = fetch_articles_for_date(
+                    mock_db, _TARGET_DATE, category=category, days=days
+                )
+
+                # Then
+                self.assertEqual(result, articles)
+                # The published_at fallback query only runs when parsed_at finds nothing
+                self.assertEqual(mock_db.query.call_count, 1 if n else 2)
 
 
 class TestProcessDailySummary(unittest.TestCase):
@@ -113,10 +74,7 @@ class TestProcessDailySummary(unittest.TestCase):
     @patch("summarizers.daily_processor.GrokSummarizer")
     def test_process_daily_summary_business_category(self, mock_grok_class, mock_fetch):
         """Test processing daily summary for business category (1 day)."""
-        # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-
-        # Mock articles
+        # Given - mock articles
         mock_article1 = MagicMock()
         mock_article1.headline = "Market Report"
         mock_article1.website = "Financial Times"
@@ -158,7 +116,7 @@ class TestProcessDailySummary(unittest.TestCase):
         }
 
         # When
-        result = process_daily_summary(self.mock_db, date=target_date, category="business", days=1)
+        result = process_daily_summary(self.mock_db, date=_TARGET_DATE, category="business", days=1)
 
         # Then
         self.assertIsNotNone(result)
@@ -169,15 +127,17 @@ class TestProcessDailySummary(unittest.TestCase):
         self.assertEqual(len(result["summary_data"]["top_articles"]), 2)
 
         # Verify fetch was called with correct parameters
-        mock_fetch.assert_called_once_with(self.mock_db, target_date, category="business", days=1)
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(
+            mock_fetch.call_args,
+            ((self.mock_db, _TARGET_DATE), {"category": "business", "days": 1}),
+        )
 
     @patch("summarizers.daily_processor.fetch_articles_for_date")
     @patch("summarizers.daily_processor.GrokSummarizer")
     def test_process_weekly_summary_engineering_category(self, mock_grok_class, mock_fetch):
         """Test processing weekly summary for engineering category (7 days)."""
         # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-
         # Mock articles (more articles for weekly)
         articles = []
         for i in range(1, 8):
@@ -216,7 +176,7 @@ class TestProcessDailySummary(unittest.TestCase):
 
         # When
         result = process_daily_summary(
-            self.mock_db, date=target_date, category="engineering", days=7
+            self.mock_db, date=_TARGET_DATE, category="engineering", days=7
         )
 
         # Then
@@ -230,20 +190,21 @@ class TestProcessDailySummary(unittest.TestCase):
         self.assertLessEqual(len(result["summary_data"]["top_articles"]), 7)
 
         # Verify fetch was called with 7 days
-        mock_fetch.assert_called_once_with(
-            self.mock_db, target_date, category="engineering", days=7
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(
+            mock_fetch.call_args,
+            ((self.mock_db, _TARGET_DATE), {"category": "engineering", "days": 7}),
         )
 
     @patch("summarizers.daily_processor.fetch_articles_for_date")
     def test_process_summary_no_articles_found(self, mock_fetch):
         """Test processing summary when no articles are found."""
         # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
         mock_fetch.return_value = []
 
         # When
         result = process_daily_summary(
-            self.mock_db, date=target_date, category="technology", days=1
+            self.mock_db, date=_TARGET_DATE, category="technology", days=1
         )
 
         # Then
@@ -254,8 +215,6 @@ class TestProcessDailySummary(unittest.TestCase):
     def test_process_summary_technology_daily(self, mock_grok_class, mock_fetch):
         """Test processing daily summary for technology category."""
         # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-
         mock_article = MagicMock()
         mock_article.headline = "AI Breakthrough"
         mock_article.website = "TechCrunch"
@@ -285,7 +244,7 @@ class TestProcessDailySummary(unittest.TestCase):
 
         # When
         result = process_daily_summary(
-            self.mock_db, date=target_date, category="technology", days=1
+            self.mock_db, date=_TARGET_DATE, category="technology", days=1
         )
 
         # Then
@@ -294,7 +253,11 @@ class TestProcessDailySummary(unittest.TestCase):
         self.assertEqual(result["articles_count"], 1)
 
         # Verify fetch was called with 1 day for daily
-        mock_fetch.assert_called_once_with(self.mock_db, target_date, category="technology", days=1)
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(
+            mock_fetch.call_args,
+            ((self.mock_db, _TARGET_DATE), {"category": "technology", "days": 1}),
+        )
 
     @patch("summarizers.daily_processor.fetch_articles_for_date")
     @patch("summarizers.daily_processor.GrokSummarizer")
@@ -328,7 +291,7 @@ class TestProcessDailySummary(unittest.TestCase):
         # Then
         self.assertIsNotNone(result)
         # Verify fetch was called (date handling is internal)
-        mock_fetch.assert_called_once()
+        self.assertEqual(mock_fetch.call_count, 1)
         call_args = mock_fetch.call_args
         # Check that it was called with a date object
         self.assertEqual(call_args[0][0], self.mock_db)
@@ -343,8 +306,6 @@ class TestTimeWindowComparison(unittest.TestCase):
     def test_daily_vs_weekly_article_count(self, mock_grok_class, mock_fetch):
         """Test that weekly summaries typically contain more articles than daily."""
         # Given
-        target_date = datetime(2025, 11, 28, 12, 0, 0)
-
         # Daily has fewer articles
         daily_articles = [MagicMock() for _ in range(3)]
         for i, article in enumerate(daily_articles):
@@ -377,12 +338,12 @@ class TestTimeWindowComparison(unittest.TestCase):
         # When
         mock_fetch.return_value = daily_articles
         daily_result = process_daily_summary(
-            MagicMock(spec=Session), date=target_date, category="business", days=1
+            MagicMock(spec=Session), date=_TARGET_DATE, category="business", days=1
         )
 
         mock_fetch.return_value = weekly_articles
         weekly_result = process_daily_summary(
-            MagicMock(spec=Session), date=target_date, category="business", days=7
+            MagicMock(spec=Session), date=_TARGET_DATE, category="business", days=7
         )
 
         # Then
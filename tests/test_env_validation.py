@@ -0,0 +1,57 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from pydantic import ValidationError
+
+from utils.env_validation import Settings, get_settings, get_telegram_settings
+
+_ENV = {
+    "DATABASE_URL": "sqlite:///:memory:",
+    "TG_API_KEY": "token",
+    "CHAT_ID": "42",
+    "XAI_API_KEY": "x",
+}
+
+
+class TestEnvValidation(unittest.TestCase):
+    def setUp(self):
+        # Only the variables under test, whatever the environment the suite runs in
+        patcher = patch.dict(os.environ, _ENV, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for cached in (get_settings, get_telegram_settings):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
+
+    def test_get_settings(self):
+        # When
+        settings = get_settings()
+
+        # Then
+        self.assertEqual(settings.TG_API_KEY, "token")
+        self.assertEqual(settings.XAI_API_KEY, "x")
+        self.assertIs(get_settings(), settings)
+
+    def test_get_telegram_settings_needs_only_telegram_variables(self):
+        # Given
+        del os.environ["DATABASE_URL"]
+        del os.environ["XAI_API_KEY"]
+
+        # When
+        settings = get_telegram_settings()
+
+        # Then
+        self.assertEqual((settings.TG_API_KEY, settings.CHAT_ID), ("token", "42"))
+
+    def test_missing_variable(self):
+        # Given
+        del os.environ["CHAT_ID"]
+
+        # When / Then
+        with self.assertRaises(ValidationError):
+            Settings(_env_file=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
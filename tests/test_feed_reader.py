@@ -0,0 +1,284 @@
+import io
+import unittest
+from unittest.mock import patch, MagicMock
+from parser.feed_reader import parse, parse_bytes
+
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>Sample Feed</title>
+    <item>
+      <title>Sample Article</title>
+      <link>http://example.com/article</link>
+      <description>Sample Description</description>
+      <pubDate>Sun, 02 Nov 2025 13:00:00 +0100</pubDate>
+      <content:encoded><![CDATA[<p>Sample Content</p>]]></content:encoded>
+    </item>
+    <item>
+      <title>Undated Article</title>
+      <link>http://example.com/undated</link>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Sample Atom Feed</title>
+  <entry>
+    <title>Atom Article</title>
+    <link rel="self" href="http://example.com/self"/>
+    <link href="http://example.com/atom-article"/>
+    <summary>Atom Summary</summary>
+    <updated>2025-11-02T12:00:00Z</updated>
+  </entry>
+</feed>
+"""
+
+RDF_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="http://example.com/">
+    <title>Sample RDF Feed</title>
+  </channel>
+  <item rdf:about="http://example.com/rdf-article">
+    <title>RDF Article</title>
+    <link>http://example.com/rdf-article</link>
+    <dc:date>2025-11-02T12:00:00Z</dc:date>
+  </item>
+</rdf:RDF>
+"""
+
+
+def _mock_response(status_code, body):
+    """Build a streamed `requests` response whose raw stream yields `body`."""
+    response = MagicMock(status_code=status_code, url="http://example.com/rss", headers={})
+    stream = io.BytesIO(body)
+    response.raw.read.side_effect = lambda amt=None, decode_content=False: stream.read(amt)
+    return response
+
+
+class TestFeedReader(unittest.TestCase):
+    def test_parse_rss_entries(self):
+        # When
+        result = parse_bytes(RSS_FEED)
+
+        # Then
+        self.assertFalse(result.bozo)
+        self.assertEqual(len(result.entries), 2)
+        entry = result.entries[0]
+        self.assertEqual(entry["title"], "Sample Article")
+        self.assertEqual(entry["link"], "http://example.com/article")
+        self.assertEqual(entry["description"], "Sample Description")
+        self.assertEqual(entry["content"][0]["value"], "<p>Sample Content</p>")
+        # pubDate is normalized to UTC like feedparser does
+        self.assertEqual(tuple(entry["published_parsed"][:6]), (2025, 11, 2, 12, 0, 0))
+        self.assertNotIn("published_parsed", result.entries[1])
+
+    def test_parse_atom_entries(self):
+        # When
+        result = parse_bytes(ATOM_FEED)
+
+        # Then
+        self.assertEqual(len(result.entries), 1)
+        entry = result.entries[0]
+        self.assertEqual(entry["title"], "Atom Article")
+        self.assertEqual(entry["link"], "http://example.com/atom-article")
+        self.assertEqual(entry["description"], "Atom Summary")
+        self.assertEqual(tuple(entry["updated_parsed"][:6]), (2025, 11, 2, 12, 0, 0))
+
+    def test_parse_rss_guid_permalink(self):
+        # Given - items without <link>, identified only by their <guid>
+        feed = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <item><title>Permalink</title><guid>http://example.com/a</guid></item>
+    <item><title>Opaque</title><guid isPermaLink="false">tag:example.com,1</guid></item>
+    <item>
+      <title>Both</title>
+      <link>http://example.com/link</link>
+      <guid isPermaLink="true">http://example.com/guid</guid>
+    </item>
+  </channel>
+</rss>
+"""
+
+        # When
+        result = parse_bytes(feed)
+
+        # Then - like feedparser, a permalink guid stands in for a missing link
+        self.assertEqual(
+            [entry.get("link") for entry in result.entries],
+            ["http://example.com/a", None, "http://example.com/link"],
+        )
+
+    def test_parse_atom_xhtml_content(self):
+        # Given
+        feed = ATOM_FEED.replace(
+            b"<summary>Atom Summary</summary>",
+            b'<summary type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">Atom <i>Summary</i>'
+            b'</div></summary><content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">'
+            b"<p>Hello <b>world</b></p></div></content>",
+        )
+
+        # When
+        entry = parse_bytes(feed).entries[0]
+
+        # Then - the markup is kept, without the wrapping div or namespaces
+        self.assertEqual(entry["description"], "Atom <i>Summary</i>")
+        self.assertEqual(entry["content"][0]["value"], "<p>Hello <b>world</b></p>")
+
+    def test_parse_rdf_entries(self):
+        # When
+        result = parse_bytes(RDF_FEED)
+
+        # Then
+        self.assertEqual([entry["title"] for entry in result.entries], ["RDF Article"])
+        self.assertEqual(tuple(result.entries[0]["published_parsed"][:6]), (2025, 11, 2, 12, 0, 0))
+
+    def test_parse_only_matches_entries_of_the_detected_format(self):
+        # Given - an RSS feed embedding an Atom entry, which isn't an article of this feed
+        feed = RSS_FEED.replace(
+            b"</channel>",
+            b'<entry xmlns="http://www.w3.org/2005/Atom"><title>Stray</title></entry></channel>',
+        )
+
+        # When
+        result = parse_bytes(feed)
+
+        # Then
+        self.assertEqual(len(result.entries), 2)
+
+    def test_parse_sanitizes_html_when_asked(self):
+        # Given - a well-formed feed, which lxml could parse on its own
+        feed = RSS_FEED.replace(
+            b"<description>Sample Description</description>",
+            b"<description>&lt;script&gt;alert(1)&lt;/script&gt;&lt;a href='/x'&gt;Safe"
+            b"&lt;/a&gt;</description>",
+        )
+
+        # When
+        raw = parse_bytes(feed)
+        sanitized = parse_bytes(feed, sanitize_html=True, resolve_relative_uris=True)
+
+        # Then
+        self.assertIn("<script>", raw.entries[0]["description"])
+        description = sanitized.entries[0]["description"]
+        self.assertNotIn("<script>", description)
+        self.assertIn("Safe", description)
+
+    @patch("parser.feed_reader.feedparser.parse")
+    def test_malformed_xml_falls_back_to_feedparser(self, mock_parse):
+        # Given
+        mock_parse.return_value = MagicMock(bozo=True, entries=[])
+
+        # When
+        result = parse_bytes(b"<rss><item>broken")
+
+        # Then
+        self.assertIs(result, mock_parse.return_value)
+        mock_parse.assert_called_once_with(
+            b"<rss><item>broken", resolve_relative_uris=False, sanitize_html=False
+        )
+
+    @patch("parser.feed_reader._SESSION.get")
+    def test_parse_fetches_and_parses(self, mock_get):
+        # Given
+        response = _mock_response(200, RSS_FEED)
+        mock_get.return_value.__enter__.return_value = response
+
+        # When
+        result = parse("http://example.com/rss")
+
+        # Then
+        self.assertEqual(result.status, 200)
+        self.assertEqual(len(result.entries), 2)
+
+    @patch("parser.feed_reader.feedparser.parse")
+    @patch("parser.feed_reader._SESSION.get")
+    def test_parse_rejects_non_feed_without_parsing(self, mock_get, mock_parse):
+        # Given
+        response = _mock_response(200, b"<!DOCTYPE html><html><body>Not found</body></html>")
+        mock_get.return_value.__enter__.return_value = response
+
+        # When
+        result = parse("http://example.com/rss")
+
+        # Then
+        self.assertTrue(result.bozo)
+        self.assertEqual(result.entries, [])
+        mock_parse.assert_not_called()
+        # Only the sniffed prefix was read
+        response.raw.read.assert_called_once()
+
+    @patch("parser.feed_reader._SESSION.get")
+    def test_parse_unrecognised_root_falls_back_to_feedparser(self, mock_get):
+        # Given - a namespace-prefixed Atom root, which the sniffed signature doesn't match
+        feed = b"""<?xml version="1.0" encoding="UTF-8"?>
+<atom:feed xmlns:atom="http://www.w3.org/2005/Atom">
+  <atom:title>Prefixed Atom Feed</atom:title>
+  <atom:entry>
+    <atom:title>Atom Article</atom:title>
+    <atom:link href="http://example.com/atom-article"/>
+  </atom:entry>
+</atom:feed>
+"""
+        mock_get.return_value.__enter__.return_value = _mock_response(200, feed)
+
+        # When
+        result = parse("http://example.com/rss")
+
+        # Then
+        self.assertEqual(result.status, 200)
+        self.assertEqual([entry["title"] for entry in result.entries], ["Atom Article"])
+
+    @patch("parser.feed_reader._SESSION.get")
+    def test_parse_conditional_get_not_modified(self, mock_get):
+        # Given
+        response = _mock_response(200, RSS_FEED)
+        response.headers = {"ETag": '"abc"', "Last-Modified": "Sun, 02 Nov 2025 12:00:00 GMT"}
+        mock_get.return_value.__enter__.side_effect = [response, _mock_response(304, b"")]
+
+        # When - the caller passes back the validators of the first fetch
+        first = parse("http://example.com/rss")
+        second = parse("http://example.com/rss", etag=first.etag, modified=first.modified)
+
+        # Then
+        self.assertEqual(len(first.entries), 2)
+        self.assertEqual(second.status, 304)
+        self.assertEqual(second.entries, [])
+        first_call, second_call = mock_get.call_args_list
+        # Nothing is remembered between calls; only the passed validators count
+        self.assertEqual(first_call.kwargs["headers"], {})
+        self.assertEqual(
+            second_call.kwargs["headers"],
+            {"If-None-Match": '"abc"', "If-Modified-Since": "Sun, 02 Nov 2025 12:00:00 GMT"},
+        )
+
+    @patch("parser.feed_reader._SESSION.get")
+    def test_parse_uses_stored_validators(self, mock_get):
+        # Given
+        mock_get.return_value.__enter__.return_value = _mock_response(304, b"")
+
+        # When
+        result = parse("http://example.com/rss", etag='"abc"', modified=None)
+
+        # Then
+        self.assertEqual(result.status, 304)
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"abc"'})
+
+    @patch("parser.feed_reader._SESSION.get")
+    def test_parse_http_error(self, mock_get):
+        # Given
+        mock_get.return_value.__enter__.return_value = _mock_response(404, b"")
+
+        # When
+        result = parse("http://example.com/rss")
+
+        # Then
+        self.assertEqual(result.status, 404)
+        self.assertEqual(result.entries, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
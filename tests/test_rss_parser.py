@@ -1,10 +1,111 @@
+import time
 import unittest
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
-from parser.rss_parser import parse_feed, process_feed_entries, update_feed_status
-from models.models import FeedStatus, Article
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from parser import rss_parser
+from parser.rss_parser import (
+    LANGDETECT_MAX_CHARS,
+    detect_language,
+    extract_content,
+    parse_published_date,
+    parse_feed,
+    parse_feeds,
+    process_feed_entries,
+    process_feeds_batch,
+    update_feed_status,
+)
+from models.models import FeedStatus, Article, ArticleCreate, FeedConfig, MAX_TEXT_LENGTH
+
+
+class _FakeQuery:
+    """Just enough of `Query` for the lookups the parser performs."""
+
+    def __init__(self, db, entity):
+        self.db = db
+        self.entity = entity
+        self.criteria = {}
+
+    def filter_by(self, **kwargs):
+        self.criteria = kwargs
+        return self
+
+    def filter(self, *criteria):
+        return self
+
+    def first(self):
+        return next(iter(self.all()), None)
+
+    def all(self):
+        if self.entity is FeedStatus:
+            return [
+                status
+                for status in self.db.statuses
+                if all(getattr(status, key) == value for key, value in self.criteria.items())
+            ]
+        self.db.hash_lookups += 1
+        return [(content_hash,) for content_hash in self.db.existing_hashes]
+
+
+class FakeDB:
+    """In-memory stand-in for a SQLAlchemy session.
+
+    Records what the parser adds and commits; `existing_hashes` simulates articles that
+    are already stored and `statuses` the stored FeedStatus rows.
+    """
+
+    def __init__(self, existing_hashes=()):
+        self.existing_hashes = list(existing_hashes)
+        self.statuses = []
+        self.added = []
+        self.commits = 0
+        self.hash_lookups = 0
+
+    @property
+    def articles(self):
+        return [obj for obj in self.added if isinstance(obj, Article)]
+
+    def query(self, entity):
+        return _FakeQuery(self, entity)
+
+    def add(self, obj):
+        if isinstance(obj, FeedStatus):
+            self.statuses.append(obj)
+        self.added.append(obj)
+
+    def bulk_save_objects(self, objs):
+        self.added.extend(objs)
+
+    def commit(self):
+        self.commits += 1
+
+    def refresh(self, obj):
+        pass
+
+    def rollback(self):
+        pass
+
+    def get_bind(self):
+        # Not a dialect with conflict-safe inserts, so articles go through bulk_save_objects()
+        return SimpleNamespace(dialect=SimpleNamespace(name="fake"))
 
 
 class TestRSSParser(unittest.TestCase):
+    def setUp(self):
+        # Each test starts without articles remembered from previous polls
+        rss_parser._SEEN_HASHES.clear()
+        self.db = FakeDB()
+        # Template feed; tests override only the fields they care about
+        self.feed_config = FeedConfig(
+            name="Test Feed",
+            url="http://example.com/rss",
+            category="News",
+            country="US",
+            language="en",
+        )
+
     @patch("parser.rss_parser.feedparser.parse")
     def test_parse_feed(self, mock_parse):
         # Given
@@ -21,30 +122,57 @@ class TestRSSParser(unittest.TestCase):
         ]
         mock_parse.return_value = mock_feed
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.side_effect = (
-            lambda *args, **kwargs: None
-        )
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-        db.refresh.side_effect = lambda article: None
-
-        feed_config = MagicMock(
-            url="http://example.com/rss",
-            name="Sample Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
+        self.feed_config.name = "Sample Feed"
 
         # When
-        result = parse_feed(db, feed_config)
+        result = parse_feed(self.db, self.feed_config)
 
         # Then
         self.assertEqual(result.processed, 1)
         self.assertEqual(result.errors, 0)
         mock_parse.assert_called_once_with("http://example.com/rss")
 
+    @patch("parser.rss_parser.feedparser.parse")
+    def test_parse_feed_sanitizes_untrusted_feed(self, mock_parse):
+        """Test that feeds flagged for sanitizing get feedparser's HTML cleanup."""
+        # Given
+        mock_parse.return_value = MagicMock(status=200, bozo=False, entries=[])
+        self.feed_config.sanitize_html = True
+
+        # When
+        parse_feed(self.db, self.feed_config)
+
+        # Then
+        mock_parse.assert_called_once_with(
+            "http://example.com/rss", resolve_relative_uris=True, sanitize_html=True
+        )
+
+    @patch("parser.rss_parser.feedparser.parse")
+    def test_parse_feed_conditional_get(self, mock_parse):
+        """Test that validators stored by the previous run are sent and refreshed."""
+        # Given
+        mock_parse.return_value = MagicMock(status=200, bozo=False, entries=[])
+        mock_parse.return_value.get = {"etag": '"v2"', "modified": None}.get
+        self.db.statuses.append(
+            FeedStatus(
+                feed_name="Test Feed",
+                feed_url="http://example.com/rss",
+                etag='"v1"',
+                last_modified="Mon, 01 Dec 2025 08:00:00 GMT",
+            )
+        )
+
+        # When
+        parse_feed(self.db, self.feed_config)
+
+        # Then
+        mock_parse.assert_called_once_with(
+            "http://example.com/rss", etag='"v1"', modified="Mon, 01 Dec 2025 08:00:00 GMT"
+        )
+        status = self.db.statuses[0]
+        self.assertEqual(status.etag, '"v2"')
+        self.assertEqual(status.last_modified, "Mon, 01 Dec 2025 08:00:00 GMT")
+
     @patch("parser.rss_parser.feedparser.parse")
     def test_parse_feed_http_error_400(self, mock_parse):
         """Test handling of HTTP 400 error."""
@@ -53,27 +181,95 @@ class TestRSSParser(unittest.TestCase):
         mock_feed.status = 404
         mock_parse.return_value = mock_feed
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.return_value = None
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-        db.refresh.side_effect = lambda article: None
-
-        feed_config = MagicMock(
-            url="http://example.com/rss",
-            name="Dead Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
+        self.feed_config.name = "Dead Feed"
 
         # When
-        result = parse_feed(db, feed_config)
+        result = parse_feed(self.db, self.feed_config)
 
         # Then
         self.assertEqual(result.processed, 0)
         self.assertEqual(result.errors, 1)
 
+    @patch("parser.rss_parser.feedparser.parse")
+    def test_parse_feed_not_modified(self, mock_parse):
+        """Test that an unchanged feed is skipped without processing entries."""
+        # Given
+        mock_feed = MagicMock()
+        mock_feed.status = 304
+        mock_feed.entries = []
+        mock_parse.return_value = mock_feed
+
+        self.feed_config.name = "Unchanged Feed"
+
+        # When
+        result = parse_feed(self.db, self.feed_config)
+
+        # Then
+        self.assertEqual(result.processed, 0)
+        self.assertEqual(result.errors, 0)
+        self.assertTrue(result.not_modified)
+        self.assertEqual(self.db.articles, [])
+
+    @patch("parser.rss_parser.feedparser.parse")
+    def test_parse_feeds_http_error(self, mock_parse):
+        """Test that one failing feed doesn't affect the rest of a batch."""
+        # Given
+        ok_feed = MagicMock()
+        ok_feed.status = 200
+        ok_feed.bozo = False
+        ok_feed.entries = []
+        dead_feed = MagicMock()
+        dead_feed.status = 404
+        mock_parse.side_effect = lambda url: dead_feed if "dead" in url else ok_feed
+
+        feed_configs = [
+            self.feed_config.model_copy(update={"name": "Live Feed"}),
+            self.feed_config.model_copy(
+                update={"name": "Dead Feed", "url": "http://example.com/dead"}
+            ),
+        ]
+
+        # When
+        results = parse_feeds(self.db, feed_configs)
+
+        # Then
+        self.assertEqual([r.errors for r in results], [0, 1])
+        self.assertEqual([r.processed for r in results], [0, 0])
+        self.assertEqual(mock_parse.call_count, 2)
+
+    @patch("parser.rss_parser.feedparser.parse")
+    def test_parse_feeds_batch_insert_failure(self, mock_parse):
+        """Test that a failing batch insert is retried feed by feed."""
+
+        # Given
+        def make_feed(title):
+            feed = MagicMock(status=200, bozo=False)
+            feed.entries = [{"title": title, "link": f"http://example.com/{title}"}]
+            return feed
+
+        mock_parse.side_effect = lambda url: make_feed("Broken" if "broken" in url else "Fine")
+
+        def bulk_save_objects(objs):
+            if any(obj.headline == "Broken" for obj in objs):
+                raise ValueError("value too long for type character varying(500)")
+            self.db.added.extend(objs)
+
+        self.db.bulk_save_objects = bulk_save_objects
+        feed_configs = [
+            self.feed_config.model_copy(update={"name": "Good Feed"}),
+            self.feed_config.model_copy(
+                update={"name": "Broken Feed", "url": "http://example.com/broken"}
+            ),
+        ]
+
+        # When
+        results = parse_feeds(self.db, feed_configs)
+
+        # Then
+        self.assertEqual([r.errors for r in results], [0, 1])
+        self.assertEqual([r.processed for r in results], [1, 0])
+        self.assertEqual([a.headline for a in self.db.articles], ["Fine"])
+
     @patch("parser.rss_parser.feedparser.parse")
     def test_parse_feed_bozo_error_no_entries(self, mock_parse):
         """Test handling of bozo error with no entries."""
@@ -85,22 +281,10 @@ class TestRSSParser(unittest.TestCase):
         mock_feed.entries = []
         mock_parse.return_value = mock_feed
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.return_value = None
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-        db.refresh.side_effect = lambda article: None
-
-        feed_config = MagicMock(
-            url="http://example.com/rss",
-            name="Broken Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
+        self.feed_config.name = "Broken Feed"
 
         # When
-        result = parse_feed(db, feed_config)
+        result = parse_feed(self.db, self.feed_config)
 
         # Then
         self.assertEqual(result.processed, 0)
@@ -125,24 +309,10 @@ class TestRSSParser(unittest.TestCase):
         ]
         mock_parse.return_value = mock_feed
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.side_effect = (
-            lambda *args, **kwargs: None
-        )
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-        db.refresh.side_effect = lambda article: None
-
-        feed_config = MagicMock(
-            url="http://example.com/rss",
-            name="Resilient Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
+        self.feed_config.name = "Resilient Feed"
 
         # When
-        result = parse_feed(db, feed_config)
+        result = parse_feed(self.db, self.feed_config)
 
         # Then
         self.assertEqual(result.processed, 1)
@@ -154,22 +324,10 @@ class TestRSSParser(unittest.TestCase):
         # Given
         mock_parse.side_effect = Exception("Network error")
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.return_value = None
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-        db.refresh.side_effect = lambda article: None
-
-        feed_config = MagicMock(
-            url="http://example.com/rss",
-            name="Unreachable Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
+        self.feed_config.name = "Unreachable Feed"
 
         # When
-        result = parse_feed(db, feed_config)
+        result = parse_feed(self.db, self.feed_config)
 
         # Then
         self.assertEqual(result.processed, 0)
@@ -188,29 +346,134 @@ class TestRSSParser(unittest.TestCase):
             }
         ]
 
-        db = MagicMock()
         # Simulate existing article
-        db.query.return_value.filter_by.return_value.first.return_value = MagicMock(
-            id=1
-        )
-
-        feed_config = MagicMock(
-            name="Test Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
+        existing_hash = ArticleCreate(
+            website="Test Feed", headline="Duplicate Article", link="http://example.com/article"
+        ).generate_hash()
+        self.db.existing_hashes = [existing_hash]
 
         # When
-        result = process_feed_entries(db, entries, feed_config)
+        result = process_feed_entries(self.db, entries, self.feed_config)
 
         # Then
         self.assertEqual(len(result), 0)  # No new articles added
-        db.add.assert_not_called()
+        self.assertEqual(self.db.added, [])
+
+    def test_process_feed_entries_duplicate_within_feed(self):
+        """Test that an article repeated within one feed is only saved once."""
+        # Given
+        entry = {
+            "title": "Repeated Article",
+            "description": "Description",
+            "link": "http://example.com/article",
+            "published_parsed": (2025, 11, 2, 12, 0, 0, 0, 0, 0),
+            "content": [{"value": "Content"}],
+        }
 
-    @patch("parser.rss_parser.langdetect.detect")
+        # When
+        result = process_feed_entries(self.db, [entry, dict(entry)], self.feed_config)
+
+        # Then
+        self.assertEqual(len(result), 1)
+        self.assertEqual(self.db.hash_lookups, 1)
+        self.assertEqual(self.db.articles, result)
+        self.assertEqual(self.db.commits, 1)
+
+    def test_process_feed_entries_skips_recently_seen(self):
+        """Test that polling the same feed again doesn't query for known articles."""
+        # Given
+        entries = [
+            {
+                "title": "Polled Article",
+                "description": "Description",
+                "link": "http://example.com/article",
+                "published_parsed": (2025, 11, 2, 12, 0, 0, 0, 0, 0),
+                "content": [{"value": "Content"}],
+            }
+        ]
+
+        # When
+        first = process_feed_entries(self.db, entries, self.feed_config)
+        second = process_feed_entries(self.db, entries, self.feed_config)
+
+        # Then
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 0)
+        self.assertEqual(self.db.hash_lookups, 1)
+
+    @patch("parser.rss_parser._existing_hashes", return_value=set())
+    def test_process_feed_entries_insert_skips_conflicts(self, mock_existing):
+        """Test that an article stored after the duplicate check doesn't fail the feed."""
+        # Given
+        engine = create_engine("sqlite://")
+        Article.__table__.create(engine)
+        entries = [
+            {
+                "title": title,
+                "description": "Description",
+                "link": f"http://example.com/{title}",
+                "published_parsed": (2025, 11, 2, 12, 0, 0, 0, 0, 0),
+                "content": [{"value": "Content"}],
+            }
+            for title in ("stored", "new")
+        ]
+
+        with Session(engine) as db:
+            # Simulate a concurrent run saving the first article after our lookup
+            stored = ArticleCreate(
+                website="Test Feed", headline="stored", link="http://example.com/stored"
+            )
+            db.add(
+                Article(
+                    website="Test Feed",
+                    headline="stored",
+                    link="http://example.com/stored",
+                    content_hash=stored.generate_hash(),
+                )
+            )
+            db.commit()
+
+            # When
+            result = process_feed_entries(db, entries, self.feed_config)
+
+            # Then
+            self.assertEqual([article.headline for article in result], ["new"])
+            self.assertEqual(db.query(Article).count(), 2)
+
+    def test_process_feeds_batch(self):
+        """Test that entries of several feeds are saved with one query and one commit."""
+
+        # Given
+        def make_entries(prefix, count):
+            return [
+                {
+                    "title": f"{prefix} Article {i}",
+                    "description": "Description",
+                    "link": f"http://example.com/{prefix}/{i}",
+                    "published_parsed": (2025, 11, 2, 12, 0, 0, 0, 0, 0),
+                    "content": [{"value": "Content"}],
+                }
+                for i in range(count)
+            ]
+
+        news = self.feed_config.model_copy(update={"name": "News Feed"})
+        tech = self.feed_config.model_copy(update={"name": "Tech Feed", "category": "Tech"})
+
+        # When
+        result = process_feeds_batch(
+            self.db, [(news, make_entries("news", 2)), (tech, make_entries("tech", 3))]
+        )
+
+        # Then
+        self.assertEqual(len(result["News Feed"]), 2)
+        self.assertEqual(len(result["Tech Feed"]), 3)
+        self.assertEqual(self.db.hash_lookups, 1)
+        self.assertEqual(len(self.db.articles), 5)
+        self.assertEqual(self.db.commits, 1)
+
+    @patch("langdetect.detect")
     def test_process_feed_entries_language_detection(self, mock_detect):
-        """Test language detection for articles."""
+        """Test language detection for articles of feeds without a declared language."""
         # Given
         mock_detect.return_value = "fr"
         entries = [
@@ -223,28 +486,46 @@ class TestRSSParser(unittest.TestCase):
             }
         ]
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.return_value = None
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-
-        feed_config = MagicMock(
-            name="French Feed",
-            language="fr",
-            category="News",
-            country="FR",
-        )
+        self.feed_config.name = "French Feed"
+        self.feed_config.language = ""
+        self.feed_config.country = "FR"
 
         # When
-        result = process_feed_entries(db, entries, feed_config)
+        result = process_feed_entries(self.db, entries, self.feed_config)
 
         # Then
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].language, "fr")
+        mock_detect.assert_called_once_with("Contenu complet")
+
+    @patch("langdetect.detect")
+    def test_process_feed_entries_declared_language(self, mock_detect):
+        """Test that the feed's declared language is used without running detection."""
+        # Given
+        entries = [
+            {
+                "title": "Article",
+                "description": "Description",
+                "link": "http://example.com/article",
+                "published_parsed": (2025, 11, 2, 12, 0, 0, 0, 0, 0),
+                "content": [{"value": "Content"}],
+            }
+        ]
+
+        self.feed_config.language = "de"
+        self.feed_config.country = "DE"
 
-    @patch("parser.rss_parser.langdetect.detect")
+        # When
+        result = process_feed_entries(self.db, entries, self.feed_config)
+
+        # Then
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].language, "de")
+        mock_detect.assert_not_called()
+
+    @patch("langdetect.detect")
     def test_process_feed_entries_language_detection_fallback(self, mock_detect):
-        """Test fallback to feed language when detection fails."""
+        """Test fallback to "unknown" when detection fails."""
         # Given
         mock_detect.side_effect = Exception("Detection failed")
         entries = [
@@ -252,29 +533,101 @@ class TestRSSParser(unittest.TestCase):
                 "title": "Article",
                 "description": "Description",
                 "link": "http://example.com/article",
-                "published_parsed": (2025, 11, 2, 12, 0, 0, 0, 0, 0),
                 "content": [{"value": "Content"}],
             }
         ]
+        self.feed_config.language = ""
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.return_value = None
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
+        # When
+        result = process_feed_entries(self.db, entries, self.feed_config)
 
-        feed_config = MagicMock(
-            name="Test Feed",
-            language="de",
-            category="News",
-            country="DE",
+        # Then
+        self.assertEqual(result[0].language, "unknown")
+
+    @patch("langdetect.detect")
+    def test_detect_language_truncates_long_text(self, mock_detect):
+        """Test that only the start of a long article is used for detection."""
+        # Given
+        mock_detect.return_value = "en"
+        text = "word " * 1000
+
+        # When
+        language = detect_language(text)
+
+        # Then
+        self.assertEqual(language, "en")
+        mock_detect.assert_called_once_with(text[:LANGDETECT_MAX_CHARS])
+
+    @patch("parser.rss_parser._fasttext_model")
+    def test_detect_language_with_fasttext_model(self, mock_model):
+        """Test that a configured fastText model takes precedence over langdetect."""
+        # Given
+        mock_model.return_value.predict.return_value = (["__label__de"], [0.98])
+
+        # When
+        language = detect_language("Guten Morgen\nBerlin")
+
+        # Then
+        self.assertEqual(language, "de")
+        mock_model.return_value.predict.assert_called_once_with("Guten Morgen Berlin", k=1)
+
+    def test_extract_content(self):
+        """Test that content is preferred over description and summary."""
+        self.assertEqual(
+            extract_content({"content": [{"value": "Full"}], "description": "Short"}), "Full"
+        )
+        self.assertEqual(extract_content({"description": "Short", "summary": "S"}), "Short")
+        self.assertEqual(extract_content({"summary": "Summary only"}), "Summary only")
+        self.assertEqual(extract_content({"title": "No body"}), "")
+        self.assertEqual(extract_content(None), "")
+        # Malformed content falls through to the next field
+        self.assertEqual(extract_content({"content": [{}], "description": "Short"}), "Short")
+        self.assertEqual(extract_content({"content": ["Plain"]}), "Plain")
+
+    def test_parse_published_date(self):
+        """Test publication dates from struct_time tuples and their fallbacks."""
+        published = time.struct_time((2025, 11, 2, 12, 30, 15, 6, 306, 0))
+        self.assertEqual(
+            parse_published_date({"published_parsed": published}),
+            datetime(2025, 11, 2, 12, 30, 15),
         )
+        self.assertEqual(
+            parse_published_date({"updated_parsed": (2025, 11, 3, 8, 0, 0, 0, 0, 0)}),
+            datetime(2025, 11, 3, 8, 0, 0),
+        )
+        self.assertEqual(
+            parse_published_date({"created_parsed": (2025, 11, 1, 7, 0, 0, 0, 0, 0)}),
+            datetime(2025, 11, 1, 7, 0, 0),
+        )
+        self.assertIsInstance(parse_published_date({}), datetime)
+        fetched_at = datetime(2025, 11, 2, 9, 0, 0)
+        self.assertEqual(parse_published_date({}, default=fetched_at), fetched_at)
+        for malformed in ("invalid", (2025, 11), (2025, 13, 1, 0, 0, 0, 0, 0, 0)):
+            with self.subTest(malformed=malformed):
+                self.assertEqual(
+                    parse_published_date({"published_parsed": malformed}, default=fetched_at),
+                    fetched_at,
+                )
+
+    def test_process_feed_entries_truncates_long_content(self):
+        """Test that oversized headlines and bodies are cut before they are stored."""
+        # Given
+        entries = [
+            {
+                "title": "t" * 600,
+                "description": "d" * (MAX_TEXT_LENGTH + 1),
+                "link": "http://example.com/article",
+                "content": [{"value": "c" * (MAX_TEXT_LENGTH + 1)}],
+            }
+        ]
 
         # When
-        result = process_feed_entries(db, entries, feed_config)
+        result = process_feed_entries(self.db, entries, self.feed_config)
 
         # Then
-        self.assertEqual(len(result), 1)
-        self.assertEqual(result[0].language, "de")
+        self.assertEqual(result[0].content, "c" * MAX_TEXT_LENGTH + "...")
+        self.assertEqual(result[0].summary, "d" * MAX_TEXT_LENGTH + "...")
+        self.assertEqual(result[0].headline, "t" * 500)
 
     def test_process_feed_entries_missing_published_date(self):
         """Test handling of entries without published date."""
@@ -289,20 +642,8 @@ class TestRSSParser(unittest.TestCase):
             }
         ]
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.return_value = None
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-
-        feed_config = MagicMock(
-            name="Test Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
-
         # When
-        result = process_feed_entries(db, entries, feed_config)
+        result = process_feed_entries(self.db, entries, self.feed_config)
 
         # Then
         self.assertEqual(len(result), 1)
@@ -329,20 +670,8 @@ class TestRSSParser(unittest.TestCase):
             },
         ]
 
-        db = MagicMock()
-        db.query.return_value.filter_by.return_value.first.return_value = None
-        db.add.side_effect = lambda article: None
-        db.commit.side_effect = lambda: None
-
-        feed_config = MagicMock(
-            name="Test Feed",
-            language="en",
-            category="News",
-            country="US",
-        )
-
         # When
-        result = process_feed_entries(db, entries, feed_config)
+        result = process_feed_entries(self.db, entries, self.feed_config)
 
         # Then - First article should be processed, second should be skipped
         self.assertEqual(len(result), 1)
@@ -3,9 +3,7 @@ from summarizers.base import NewsSummarizer
 
 
 class ConcreteSummarizer(NewsSummarizer):
-    @property
-    def model_name(self) -> str:
-        return "concrete"
+    model_name = "concrete"
 
     def summarize_articles(self, articles):
         return ";".join(a.get("headline", "") for a in articles)
@@ -23,8 +21,12 @@ class TestSummarizerBaseExtra(unittest.TestCase):
         result = None
         NewsSummarizer.summarize_articles(None, [])
 
-        prop = NewsSummarizer.model_name
-        prop.fget(None)
-
         with self.assertRaises(TypeError):
             NewsSummarizer()
+
+    def test_subclass_without_model_name(self):
+        with self.assertRaises(TypeError):
+
+            class UnnamedSummarizer(NewsSummarizer):
+                def summarize_articles(self, articles):
+                    return ""
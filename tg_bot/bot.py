@@ -1,25 +1,145 @@
-import os
+import atexit
 import logging
+import random
+import threading
 import time
+import orjson
 import requests
-from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session
+from requests.adapters import HTTPAdapter
+from functools import lru_cache
+from datetime import UTC, date, datetime, timedelta
+from collections.abc import Iterator
+from sqlalchemy.orm import Session, load_only
 from db.database import get_db
 from models.models import DailySummary
+from utils.env_validation import get_telegram_settings
 
-# Initialize bot token
-API_TOKEN = os.getenv("TG_API_KEY")
-if not API_TOKEN:
-    raise ValueError("TG_API_KEY is not set in the environment variables.")
+# Telegram limits
+TG_MAX_MESSAGE_CHARS = 4096
+# Messages per second: overall for the bot, and within a single chat
+TG_GLOBAL_RATE = 30
+TG_CHAT_RATE = 1
 
-CHAT_ID = os.getenv("CHAT_ID")
-if not CHAT_ID:
-    raise ValueError("CHAT_ID is not set in the environment variables.")
+# Retry backoff: BASE_DELAY * 2**attempt seconds, stretched by up to JITTER and capped
+# at MAX_DELAY, so retrying clients don't hit the API in lockstep
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+JITTER = 0.5
 
-logging.basicConfig(level=logging.INFO)
+# One pooled session so every message after the first reuses the TLS connection;
+# retries are handled by send_telegram_message, not urllib3. Messages are sent one at a
+# time, so a single keep-alive connection is all the pool needs.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(max_retries=0, pool_maxsize=1))
+atexit.register(_SESSION.close)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Per-chat rate limiters, created on first send (see _throttle)
+_CHAT_BUCKETS = {}
+_CHAT_BUCKETS_LOCK = threading.Lock()
+
+# Messages use legacy Markdown, where only these characters are markup. Untrusted text is
+# escaped in one str.translate pass; inside link text nothing is parsed until "]", so
+# brackets there are swapped for parentheses instead.
+_MD_ESCAPE = str.maketrans({c: "\\" + c for c in "_*`["})
+_MD_LINK_TEXT = str.maketrans("[]", "()")
+
+_ONE_DAY = timedelta(days=1)
+
+# How summary dates are shown in messages, e.g. "November 28, 2025"
+_DATE_FMT = "%B %d, %Y"
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second, in bursts of `capacity`."""
+
+    __slots__ = ("capacity", "tokens", "rate", "updated", "lock")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.tokens = capacity
+        self.rate = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until it is available.
+
+        The token is reserved under the lock (the balance may go negative) and the wait
+        happens outside it, so concurrent callers queue up at `rate` per second.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
 
-# Telegram limits
-TG_MAX_MESSAGE_CHARS = 4096
+
+# Sends wait for a token instead of running into 429 Retry-After stalls
+_GLOBAL_BUCKET = _TokenBucket(TG_GLOBAL_RATE, TG_GLOBAL_RATE)
+
+
+class _Breaker:
+    """Circuit breaker that stops sends once Telegram looks down.
+
+    Opens after THRESHOLD consecutive network/5xx failures; while open, sends fail fast
+    instead of sitting through retries and backoff. After COOLDOWN seconds a single probe
+    is let through (half-open): success closes the breaker, failure opens it again.
+    """
+
+    THRESHOLD = 5
+    COOLDOWN = 60.0
+
+    __slots__ = ("fails", "opened_at", "probing", "lock")
+
+    def __init__(self):
+        self.fails = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self.lock:
+            if self.fails < self.THRESHOLD:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.COOLDOWN:
+                return False
+            self.probing = True
+            return True
+
+    def record(self, ok: bool) -> None:
+        """Record the outcome of a request; `ok` is False for network and 5xx errors."""
+        with self.lock:
+            self.probing = False
+            if ok:
+                self.fails = 0
+            else:
+                self.fails += 1
+                self.opened_at = time.monotonic()
+
+
+_BREAKER = _Breaker()
+
+
+def _throttle(chat_id: str) -> None:
+    """Wait until a message may be sent to `chat_id` without hitting Telegram's limits."""
+    with _CHAT_BUCKETS_LOCK:
+        bucket = _CHAT_BUCKETS.get(chat_id)
+        if bucket is None:
+            bucket = _CHAT_BUCKETS[chat_id] = _TokenBucket(TG_CHAT_RATE, TG_CHAT_RATE)
+    _GLOBAL_BUCKET.acquire()
+    bucket.acquire()
+
+
+@lru_cache(maxsize=8)
+def _api_url(bot_token: str, method: str) -> str:
+    """Bot API endpoint for `method`, built once per token rather than per send."""
+    return f"https://api.telegram.org/bot{bot_token}/{method}"
 
 
 def _split_message(message: str, limit: int = TG_MAX_MESSAGE_CHARS):
@@ -27,46 +147,70 @@ def _split_message(message: str, limit: int = TG_MAX_MESSAGE_CHARS):
     if len(message) <= limit:
         return [message]
 
-    paragraphs = message.split("\n\n")
+    # Walk the paragraphs ("\n\n"-separated) by offset instead of splitting the message;
+    # a chunk is the slice from its first paragraph's start to its last paragraph's end
     chunks = []
-    current = []
+    chunk_start = None
+    chunk_end = 0
     cur_len = 0
-
-    for p in paragraphs:
-        piece = p + "\n\n"
-        if cur_len + len(piece) <= limit:
-            current.append(piece)
-            cur_len += len(piece)
+    start = 0
+    end_of_message = len(message)
+
+    while start <= end_of_message:
+        end = message.find("\n\n", start)
+        if end == -1:
+            end = end_of_message
+        # Length of the paragraph plus the "\n\n" separating it from the next one
+        plen = end - start + 2
+
+        if cur_len + plen <= limit:
+            if chunk_start is None:
+                chunk_start = start
+            chunk_end = end
+            cur_len += plen
         else:
-            if current:
-                chunks.append("".join(current).rstrip())
+            if chunk_start is not None:
+                chunks.append(message[chunk_start:chunk_end].rstrip())
             # paragraph itself might be larger than limit
-            if len(piece) > limit:
+            if plen > limit:
                 # hard split the paragraph
-                for i in range(0, len(piece), limit):
-                    chunks.append(piece[i : i + limit])
-                current = []
+                chunks.extend(message[i : min(i + limit, end)] for i in range(start, end, limit))
+                chunk_start = None
                 cur_len = 0
             else:
-                current = [piece]
-                cur_len = len(piece)
+                chunk_start = start
+                chunk_end = end
+                cur_len = plen
+
+        start = end + 2
 
-    if current:
-        chunks.append("".join(current).rstrip())
+    if chunk_start is not None:
+        chunks.append(message[chunk_start:chunk_end].rstrip())
 
     return chunks
 
 
+def _parse(resp: requests.Response) -> dict:
+    """Decode a Bot API response body with orjson, which is faster than `resp.json()`."""
+    try:
+        return orjson.loads(resp.content)
+    except orjson.JSONDecodeError:
+        return {"ok": False, "error": "invalid-json-response", "status_code": resp.status_code}
+
+
 def _send_document(bot_token: str, chat_id: str, text: str):
     """Send long text as a .txt document via sendDocument endpoint."""
-    url = f"https://api.telegram.org/bot{bot_token}/sendDocument"
+    url = _api_url(bot_token, "sendDocument")
     files = {"document": ("summary.txt", text.encode("utf-8"))}
     data = {"chat_id": chat_id}
-    resp = requests.post(url, data=data, files=files, timeout=30)
-    try:
-        return resp.json()
-    except Exception:
-        return {"ok": False, "error": "invalid-json-response", "status_code": resp.status_code}
+    _throttle(chat_id)
+    resp = _SESSION.post(url, data=data, files=files, timeout=30)
+    return _parse(resp)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Jittered exponential backoff delay for retry `attempt` (0-based)."""
+    return min(MAX_DELAY, BASE_DELAY * 2**attempt * (1 + random.random() * JITTER))
 
 
 def send_telegram_message(bot_token, chat_id, message, max_retries: int = 3):
@@ -74,33 +218,33 @@ def send_telegram_message(bot_token, chat_id, message, max_retries: int = 3):
 
     Returns the last Telegram response JSON.
     """
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    url = _api_url(bot_token, "sendMessage")
 
     chunks = _split_message(message, TG_MAX_MESSAGE_CHARS)
     last_resp = None
 
     for idx, chunk in enumerate(chunks):
+        # Serialized once per chunk (as JSON rather than form-encoded), not per attempt
+        body = orjson.dumps({"chat_id": chat_id, "text": chunk, "parse_mode": "Markdown"})
         attempt = 0
         while attempt < max_retries:
-            payload = {"chat_id": chat_id, "text": chunk, "parse_mode": "Markdown"}
+            if not _BREAKER.allow():
+                logging.warning("Telegram circuit breaker open, not sending")
+                return {"ok": False, "error": "breaker-open"}
             try:
-                resp = requests.post(url, data=payload, timeout=30)
+                _throttle(chat_id)
+                resp = _SESSION.post(url, data=body, headers=_JSON_HEADERS, timeout=30)
             except requests.RequestException as e:
+                _BREAKER.record(ok=False)
                 logging.warning(
                     f"Network error sending Telegram message (attempt {attempt + 1}): {e}"
                 )
                 attempt += 1
                 continue
 
-            last_resp = None
-            try:
-                last_resp = resp.json()
-            except Exception:
-                last_resp = {
-                    "ok": False,
-                    "error": "invalid-json-response",
-                    "status_code": resp.status_code,
-                }
+            # Any non-5xx answer means Telegram itself is reachable
+            _BREAKER.record(ok=resp.status_code < 500)
+            last_resp = _parse(resp)
 
             # Handle common cases
             if resp.status_code == 200 and last_resp.get("ok"):
@@ -124,7 +268,7 @@ def send_telegram_message(bot_token, chat_id, message, max_retries: int = 3):
 
             # Too many requests - respect retry-after
             if resp.status_code == 429:
-                retry_after = int(resp.headers.get("Retry-After", 5))
+                retry_after = min(int(resp.headers.get("Retry-After", 5)), MAX_DELAY)
                 logging.warning(f"Telegram rate limited, retrying after {retry_after}s")
                 time.sleep(retry_after)
                 attempt += 1
@@ -132,8 +276,10 @@ def send_telegram_message(bot_token, chat_id, message, max_retries: int = 3):
 
             # Server errors - backoff and retry
             if 500 <= resp.status_code < 600:
-                backoff = 2**attempt
-                logging.warning(f"Telegram server error {resp.status_code}, backing off {backoff}s")
+                backoff = _backoff_delay(attempt)
+                logging.warning(
+                    f"Telegram server error {resp.status_code}, backing off {backoff:.1f}s"
+                )
                 time.sleep(backoff)
                 attempt += 1
                 continue
@@ -148,12 +294,37 @@ def send_telegram_message(bot_token, chat_id, message, max_retries: int = 3):
     return last_resp or {"ok": False, "error": "no-response"}
 
 
-def get_daily_summaries(db: Session):
-    # Use timezone-aware UTC to compute yesterday
-    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).date()
-    summaries = db.query(DailySummary).filter(DailySummary.date == yesterday).all()
-    return [
-        {
+def _yesterday_utc() -> date:
+    """Yesterday's date in UTC."""
+    return (datetime.now(UTC) - _ONE_DAY).date()
+
+
+def get_daily_summaries(db: Session, yesterday: date | None = None) -> Iterator[dict]:
+    """Yield the summaries for `yesterday` (UTC by default) as dicts, streaming rows."""
+    if yesterday is None:
+        yesterday = _yesterday_utc()
+    # Only fetch the columns the message is built from, not raw_json and the other blobs
+    summaries = (
+        db.query(DailySummary)
+        .options(
+            load_only(
+                DailySummary.id,
+                DailySummary.date,
+                DailySummary.category,
+                DailySummary.country,
+                DailySummary.text_summary,
+                DailySummary.articles_count,
+                DailySummary.main_events,
+                DailySummary.key_themes,
+                DailySummary.detailed_summary,
+                DailySummary.top_articles,
+            )
+        )
+        .filter(DailySummary.date == yesterday)
+        .yield_per(100)
+    )
+    for summary in summaries:
+        yield {
             "id": summary.id,
             "date": summary.date,
             "category": summary.category,
@@ -165,64 +336,81 @@ def get_daily_summaries(db: Session):
             "detailed_summary": summary.detailed_summary,
             "top_articles": summary.top_articles,
         }
-        for summary in summaries
-    ]
+
+
+def _format_top_article(idx: int, article: dict) -> str:
+    """Format one numbered top-article line, linked when the article has a URL."""
+    text = f"{article.get('title', 'Article')} - {article.get('source', 'Unknown')}"
+    link = article.get("link", "")
+    if link:
+        # Format as Markdown hyperlink: [text](url)
+        return f"  {idx}. [{text.translate(_MD_LINK_TEXT)}]({link})"
+    return f"  {idx}. {text.translate(_MD_ESCAPE)}"
 
 
 def format_summary(summary):
-    # Ensure the date is formatted correctly
-    if isinstance(summary["date"], datetime):
-        formatted_date = summary["date"].strftime("%B %d, %Y")
+    # Ensure the date is formatted correctly; datetimes are dates too
+    if isinstance(summary["date"], date):
+        formatted_date = summary["date"].strftime(_DATE_FMT)
     else:
-        formatted_date = datetime.strptime(summary["date"], "%Y-%m-%d %H:%M:%S").strftime(
-            "%B %d, %Y"
-        )
+        # "YYYY-MM-DD HH:MM:SS" string; only the ISO date part is shown
+        formatted_date = date.fromisoformat(summary["date"][:10]).strftime(_DATE_FMT)
+
+    # Bullet lists are built up front so the body is assembled in one f-string
+    events = "".join(
+        f"  - {event.translate(_MD_ESCAPE)}\n" for event in summary["main_events"].values()
+    )
+    themes = "".join(
+        f"  - {theme.translate(_MD_ESCAPE)}\n" for theme in summary["key_themes"].values()
+    )
+    # Detailed summary (raw)
+    detailed = summary.get("detailed_summary") or ""
 
-    formatted = (
+    parts = [
         f"📅 Date: {formatted_date}\n"
         f"📂 Category: {summary['category']}\n"
         f"🌍 Country: {summary['country']}\n"
         f"📰 Articles Count: {summary['articles_count']}\n\n"
         f"📝 Summary:\n{summary['text_summary']}\n\n"
-        f"🔑 Main Events:\n"
-    )
-    for key, event in summary["main_events"].items():
-        formatted += f"  - {event}\n"
-    formatted += "\n💡 Key Themes:\n"
-    for key, theme in summary["key_themes"].items():
-        formatted += f"  - {theme}\n"
-    # Detailed summary (raw)
-    detailed = summary.get("detailed_summary") or ""
-    formatted += f"\n📖 Detailed Summary:\n{detailed}\n"
+        f"🔑 Main Events:\n{events}"
+        f"\n💡 Key Themes:\n{themes}"
+        f"\n📖 Detailed Summary:\n{detailed}\n"
+    ]
 
     # Add top articles as clickable hyperlinks
     top_articles = summary.get("top_articles") or []
     if top_articles:
-        formatted += "\n🔗 Top Articles:\n"
-        for idx, article in enumerate(top_articles[:10], 1):
-            title = article.get("title", "Article")
-            source = article.get("source", "Unknown")
-            link = article.get("link", "")
-            if link:
-                # Format as Markdown hyperlink: [text](url)
-                formatted += f"  {idx}. [{title} - {source}]({link})\n"
-            else:
-                formatted += f"  {idx}. {title} - {source}\n"
+        lines = "\n".join(
+            _format_top_article(idx, article) for idx, article in enumerate(top_articles[:10], 1)
+        )
+        parts.append(f"\n🔗 Top Articles:\n{lines}\n")
 
-    return formatted
+    return "".join(parts)
 
 
 def send_daily_summary():
+    settings = get_telegram_settings()
+    api_token = settings.TG_API_KEY
+    chat_id = settings.CHAT_ID
+
     db = next(get_db())
-    summaries = get_daily_summaries(db)
-    if summaries:
-        for summary in summaries:
-            formatted_summary = format_summary(summary)
-            response = send_telegram_message(API_TOKEN, CHAT_ID, formatted_summary)
-            logging.info(f"Message sent: {response}")
-    else:
+    # Summaries are formatted and sent one at a time as they stream out of the database
+    # The date is fixed once for the whole batch, so a run spanning midnight stays consistent
+    yesterday = _yesterday_utc()
+    messages = (format_summary(summary) for summary in get_daily_summaries(db, yesterday))
+    sent_any = False
+    # Sent one after another: every summary goes to the same chat, which takes a message
+    # per second anyway (see _throttle), and concurrent sends would interleave the chunks
+    # of different summaries
+    for message in messages:
+        response = send_telegram_message(api_token, chat_id, message)
+        sent_any = True
+        logging.info(f"Message sent: {response}")
+
+    if not sent_any:
         logging.info("No summaries available to send.")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     send_daily_summary()
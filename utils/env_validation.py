@@ -1,18 +1,39 @@
-from pydantic import BaseSettings, Field, ValidationError
+from functools import lru_cache
 
+from pydantic import Field, ValidationError
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-class Settings(BaseSettings):
-    DATABASE_URL: str = Field(..., env="DATABASE_URL")
-    TG_API_KEY: str = Field(..., env="TG_API_KEY")
-    CHAT_ID: str = Field(..., env="CHAT_ID")
-    XAI_API_KEY: str = Field(..., env="XAI_API_KEY")
 
-    class Config:
-        env_file = ".env"
+class TelegramSettings(BaseSettings):
+    """What the Telegram bot needs; it doesn't touch xAI or the rest of the app's config."""
 
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
-try:
-    settings = Settings()
-except ValidationError as e:
-    print("Environment validation error:", e)
-    raise
+    TG_API_KEY: str = Field(..., validation_alias="TG_API_KEY")
+    CHAT_ID: str = Field(..., validation_alias="CHAT_ID")
+
+
+class Settings(TelegramSettings):
+    DATABASE_URL: str = Field(..., validation_alias="DATABASE_URL")
+    XAI_API_KEY: str = Field(..., validation_alias="XAI_API_KEY")
+
+
+def _load(settings_cls: type[BaseSettings]) -> BaseSettings:
+    """Validate `settings_cls` against the environment, reporting what is wrong."""
+    try:
+        return settings_cls()
+    except ValidationError as e:
+        print("Environment validation error:", e)
+        raise
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Validated settings, read from the environment and .env once per process."""
+    return _load(Settings)
+
+
+@lru_cache(maxsize=1)
+def get_telegram_settings() -> TelegramSettings:
+    """Validated Telegram credentials, read from the environment and .env once per process."""
+    return _load(TelegramSettings)